@@ -0,0 +1,49 @@
+"""
+Асинхронный путь чтения для режима ASGI.
+
+В Django 3.2 нет асинхронного ORM, а синхронные представления под ASGI
+выполняются по очереди в одном общем потоке. Здесь представление DRF
+оборачивается в корутину: безопасные методы выполняются в пуле потоков
+(sync_to_async с thread_sensitive=False), каждый со своим соединением
+с базой, поэтому медленные клиенты и ожидание базы не задерживают
+остальные запросы. Запись остаётся синхронной и идёт через общий поток,
+как у обычного представления Django.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from rest_framework.permissions import SAFE_METHODS
+
+
+def run_read(view, request, *args, **kwargs):
+    """
+    Выполняет и отрисовывает ответ в потоке пула. Соединения потока
+    закрываются так же, как по сигналам начала и конца запроса.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response.render()
+
+            async def rendered():
+                return response
+            # Иначе Django вызовет render ещё раз в общем потоке.
+            response.render = rendered
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(view):
+    """Корутина-представление поверх синхронного представления DRF."""
+    read = sync_to_async(run_read, thread_sensitive=False)
+    write = sync_to_async(view, thread_sensitive=True)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read(view, request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+    return async_view
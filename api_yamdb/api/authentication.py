@@ -0,0 +1,118 @@
+"""
+JWT-аутентификация без обращения к базе данных на каждый запрос.
+
+Поля пользователя (кроме пароля) хранятся в кэше API по ключу с его id
+и удаляются сигналами при сохранении или удалении пользователя. Для
+общего с несколькими воркерами сброса кэш должен быть общим
+(см. CACHE_BACKEND).
+
+При JWT_TRUST_ROLE_CLAIMS=True безопасные запросы вообще не загружают
+пользователя: роль берётся из подписанного токена. Изменение роли при
+этом вступает в силу для чтения только с новым токеном. Права
+администратора по токену не проверяются: для них пользователь
+загружается из базы (см. stored_user).
+"""
+from django.conf import settings
+from django.db import router
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+
+from .cache import get_cache
+
+USER_KEY = 'api:user:{}'
+ROLE_CLAIMS = ('username', 'role', 'is_admin')
+# Пароль в кэш не попадает: у восстановленного объекта он отложенное поле.
+CACHED_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname != 'password'
+)
+
+
+def get_access_token(user):
+    """Токен доступа с подписанными сведениями о роли пользователя."""
+    token = AccessToken.for_user(user)
+    token['username'] = user.username
+    token['role'] = user.role
+    token['is_admin'] = user.is_admin
+    return token
+
+
+def forget_user(user_id):
+    get_cache().delete(USER_KEY.format(user_id))
+
+
+def stored_user(user):
+    """
+    Пользователь для проверки прав администратора. Роль в токене могла
+    устареть — администратора могли разжаловать или удалить, — поэтому
+    пользователь из токена заменяется записью из базы (None, если её
+    нет или пользователь неактивен).
+    """
+    if not isinstance(user, RoleTokenUser):
+        return user
+    user = User.objects.filter(
+        **{api_settings.USER_ID_FIELD: user.id}).first()
+    return user if user is not None and user.is_active else None
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Пользователь, восстановленный из утверждений токена. Годится только
+    для непривилегированных проверок.
+    """
+
+    @property
+    def role(self):
+        return self.token['role']
+
+    @property
+    def is_admin(self):
+        return self.token['is_admin']
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication с кэшем пользователей по id."""
+
+    def authenticate(self, request):
+        self.request = request
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if (
+            settings.JWT_TRUST_ROLE_CLAIMS
+            and self.request.method in SAFE_METHODS
+            and api_settings.USER_ID_CLAIM in validated_token
+            and all(claim in validated_token for claim in ROLE_CLAIMS)
+        ):
+            return RoleTokenUser(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя')
+        key = USER_KEY.format(user_id)
+        cache = get_cache()
+        values = cache.get(key)
+        if values is None:
+            values = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*CACHED_FIELDS).first()
+            if values is None:
+                raise AuthenticationFailed(
+                    'Пользователь не найден', code='user_not_found')
+            cache.set(key, values, settings.JWT_USER_CACHE_TIMEOUT)
+        user = User.from_db(router.db_for_read(User), CACHED_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь неактивен', code='user_inactive')
+        return user
@@ -0,0 +1,87 @@
+"""
+Кэш ответов справочных эндпоинтов.
+
+Ключ ответа строится из пути, строки запроса, роли пользователя и
+текущих версий ресурсов, от которых зависит ответ. Версии хранятся
+в том же кэше и увеличиваются сигналами при изменении моделей, поэтому
+устаревшие ответы просто перестают запрашиваться и вытесняются сами.
+"""
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+from users.models import User
+
+from .replicas import primary_reads
+
+VERSION_KEY = 'api:version:{}'
+RESPONSE_KEY = 'api:response:{}'
+CACHE_HEADER = 'X-Cache'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def initial_version():
+    # Новая версия после вытеснения ключа не совпадёт ни с одной прежней.
+    return time.time_ns()
+
+
+def get_versions(resources):
+    cache = get_cache()
+    keys = [VERSION_KEY.format(resource) for resource in resources]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_version(resource):
+    cache = get_cache()
+    key = VERSION_KEY.format(resource)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, initial_version(), timeout=None)
+
+
+def get_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    return User.ADMIN if user.is_admin else user.role
+
+
+def response_cache_key(request, resources):
+    query = sorted(request.query_params.lists())
+    raw = (
+        f'{request.path}|{query}|{get_role(request.user)}|'
+        f'{get_versions(resources)}'
+    )
+    return RESPONSE_KEY.format(md5(raw.encode('utf-8')).hexdigest())
+
+
+def cached_response(view, handler, request, *args, **kwargs):
+    """Возвращает ответ handler из кэша или вычисляет и сохраняет его."""
+    cache = get_cache()
+    key = response_cache_key(request, view.cache_resources)
+    data = cache.get(key)
+    if data is not None:
+        response = Response(data)
+        response[CACHE_HEADER] = 'HIT'
+    else:
+        # Версия в ключе уже новая, а реплика может ещё отставать:
+        # ответ для общего кэша читается с основной базы.
+        with primary_reads():
+            response = handler(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        response[CACHE_HEADER] = 'MISS'
+    patch_vary_headers(response, ('Authorization',))
+    return response
@@ -0,0 +1,37 @@
+"""
+Условные GET-запросы (If-None-Match).
+
+Валидатор ответа вычисляется без сериализации: из версий ресурсов
+в кэше и/или из агрегата Max(updated_at), Count(pk) по выборке.
+Last-Modified не отдаётся: в HTTP-дате только целые секунды, и правка
+в ту же секунду осталась бы незамеченной, а ETag учитывает микросекунды.
+"""
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .cache import get_versions
+
+
+def get_etag(view, request, queryset):
+    parts = [request.path, sorted(request.query_params.lists())]
+    if view.etag_resources:
+        parts.append(get_versions(view.etag_resources))
+    if view.etag_from_queryset:
+        # Удаление не сдвигает Max(updated_at), поэтому нужен и Count.
+        marker = queryset.order_by().aggregate(
+            last_modified=Max('updated_at'), total=Count('pk'))
+        parts.append((marker['last_modified'], marker['total']))
+    return quote_etag(md5(repr(parts).encode('utf-8')).hexdigest())
+
+
+def conditional_response(view, handler, request, queryset, *args, **kwargs):
+    """Отвечает 304, если у клиента актуальная версия ресурса."""
+    etag = get_etag(view, request, queryset)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = handler(request, *args, **kwargs)
+    response['ETag'] = etag
+    return response
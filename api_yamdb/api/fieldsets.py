@@ -0,0 +1,60 @@
+"""
+Выбор полей ответа: ?fields=id,name,rating и ?expand=category.
+
+Без параметров ответ не меняется. С ?fields= в ответ попадают только
+перечисленные поля; с ?expand= связанные объекты из списка выводятся
+целиком, а остальные — своими slug. Незапрошенные поля не загружаются
+из базы данных: viewset строит выборку по Fieldset.
+"""
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+class Fieldset:
+    """Запрошенные поля ответа и связи, которые нужно развернуть."""
+
+    def __init__(self, fields, expand):
+        self.fields = fields
+        self.expand = expand
+
+    def slug_relations(self, relations):
+        """Связи из relations, которые выводятся только slug."""
+        return [
+            name for name in relations
+            if name in self.fields and name not in self.expand
+        ]
+
+
+def split_param(request, name):
+    values = request.query_params.get(name, '').split(',')
+    return list(dict.fromkeys(value.strip() for value in values if value))
+
+
+def get_fieldset(request, available, relations):
+    """
+    Разбирает ?fields= и ?expand=; возвращает None, если ни один
+    параметр не передан.
+    """
+    params = request.query_params
+    if FIELDS_PARAM not in params and EXPAND_PARAM not in params:
+        return None
+    errors = {}
+    fields = split_param(request, FIELDS_PARAM) or list(available)
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        errors[FIELDS_PARAM] = [f'Неизвестные поля: {", ".join(unknown)}.']
+    expand = relations
+    if EXPAND_PARAM in params:
+        expand = split_param(request, EXPAND_PARAM)
+        unknown = [name for name in expand if name not in relations]
+        if unknown:
+            errors[EXPAND_PARAM] = [
+                f'Нельзя развернуть поля: {", ".join(unknown)}.']
+    if errors:
+        raise ValidationError(errors)
+    return Fieldset(
+        fields=tuple(name for name in available if name in fields),
+        expand=frozenset(expand),
+    )
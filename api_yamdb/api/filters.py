@@ -1,5 +1,8 @@
 import django_filters as filters
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
 from reviews.models import Title
+from reviews.search import search_titles
 
 
 class TitleFilter(filters.FilterSet):
@@ -19,3 +22,21 @@ class TitleFilter(filters.FilterSet):
     class Meta:
         model = Title
         fields = ('name', 'category', 'genre', 'year')
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск ?search= по названию и описанию произведения.
+    Без явного ?ordering= результаты сортируются по релевантности.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        queryset = search_titles(queryset, text)
+        if api_settings.ORDERING_PARAM in request.query_params:
+            return queryset
+        return queryset.order_by('-search_rank', 'name', 'id')
@@ -0,0 +1,240 @@
+"""
+Метрики приложения в формате Prometheus.
+
+Каждый процесс (воркер gunicorn) копит значения в памяти и не чаще
+раза в METRICS_FLUSH_INTERVAL секунд записывает их в свой файл
+<pid>.<суффикс>.json в каталоге METRICS_DIR; случайный суффикс не даёт
+новому процессу с тем же pid заменить файл завершившегося. Эндпоинт
+/metrics складывает файлы всех процессов, поэтому ответ не зависит от
+того, какой воркер его обработал. Файлы завершившихся воркеров
+остаются, чтобы счётчики не уменьшались. Файлы прежнего запуска
+удаляет clear_metrics: её вызывает хук on_starting в gunicorn.conf.py,
+при другом сервере каталог нужно очищать перед запуском.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import suppress
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+METRICS = {
+    'yamdb_http_requests_total': (
+        'counter', 'HTTP requests by view, action and status code.'),
+    'yamdb_http_request_duration_seconds': (
+        'histogram', 'HTTP request latency by view and action.'),
+    'yamdb_db_queries_total': (
+        'counter', 'Database queries by view and action.'),
+    'yamdb_db_query_duration_seconds_total': (
+        'counter', 'Time spent in database queries by view and action.'),
+    'yamdb_cache_requests_total': (
+        'counter', 'Response cache lookups by view and result.'),
+}
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsStore:
+    """Значения метрик текущего процесса и их файл в каталоге."""
+
+    def __init__(self, directory, flush_interval):
+        self.directory = Path(directory)
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pid = None
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.name = f'{self.pid}.{uuid.uuid4().hex[:12]}'
+        self.values = {name: {} for name in METRICS}
+        self.flushed = None
+
+    def check_fork(self):
+        # После fork дочерний процесс начинает со своих нулей, иначе
+        # значения родителя попадут в сумму дважды.
+        if os.getpid() != self.pid:
+            self.reset()
+
+    def inc(self, name, labels, amount=1):
+        key = json.dumps(labels, sort_keys=True)
+        with self.lock:
+            self.check_fork()
+            series = self.values[name]
+            series[key] = series.get(key, 0) + amount
+        self.maybe_flush()
+
+    def observe(self, name, labels, value):
+        key = json.dumps(labels, sort_keys=True)
+        with self.lock:
+            self.check_fork()
+            series = self.values[name]
+            if key not in series:
+                series[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0]
+            buckets = series[key]
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    break
+            else:
+                index = len(LATENCY_BUCKETS)
+            buckets[index] += 1
+            buckets[-1] += value
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        if (self.flushed is None
+                or time.monotonic() - self.flushed >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            self.check_fork()
+            self.flushed = time.monotonic()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # У каждой записи свой временный файл: чужая запись не может
+            # заменить или удалить его раньше времени.
+            handle, temporary = tempfile.mkstemp(
+                dir=self.directory, prefix=f'{self.name}.', suffix='.tmp')
+            try:
+                with os.fdopen(handle, 'w', encoding='utf-8') as file:
+                    json.dump(self.values, file)
+                # Замена атомарна: читатель видит старый или новый файл.
+                os.replace(temporary, self.directory / f'{self.name}.json')
+            except BaseException:
+                with suppress(OSError):
+                    os.unlink(temporary)
+                raise
+
+    def collect(self):
+        """Сумма значений всех процессов: {метрика: {labels: значение}}."""
+        self.flush()
+        total = {name: {} for name in METRICS}
+        for path in sorted(self.directory.glob('*.json')):
+            try:
+                values = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            for name, series in values.items():
+                merged = total.setdefault(name, {})
+                for key, value in series.items():
+                    merged[key] = add_values(merged.get(key), value)
+        return total
+
+
+def add_values(left, right):
+    if left is None:
+        return right
+    if isinstance(right, list):
+        return [a + b for a, b in zip(left, right)]
+    return left + right
+
+
+def clear_metrics(directory=None):
+    """
+    Удаляет файлы метрик прежнего запуска сервера. Вызывается до старта
+    воркеров, иначе их счётчики попадут в сумму /metrics.
+    """
+    directory = Path(directory or settings.METRICS_DIR)
+    for pattern in ('*.json', '*.tmp'):
+        for path in directory.glob(pattern):
+            with suppress(FileNotFoundError):
+                path.unlink()
+
+
+_stores = {}
+
+
+def get_store():
+    """Хранилище процесса для каталога METRICS_DIR."""
+    directory = str(settings.METRICS_DIR)
+    if directory not in _stores:
+        _stores[directory] = MetricsStore(
+            directory, settings.METRICS_FLUSH_INTERVAL)
+    return _stores[directory]
+
+
+def view_labels(request):
+    """Представление и действие DRF, обработавшие запрос."""
+    match = request.resolver_match
+    if match is None:
+        return {'view': 'unmatched', 'action': request.method.lower()}
+    view_class = getattr(match.func, 'cls', None)
+    actions = getattr(match.func, 'actions', None) or {}
+    return {
+        'view': view_class.__name__ if view_class else match.view_name,
+        'action': actions.get(request.method.lower(),
+                              request.method.lower()),
+    }
+
+
+def record_request(request, response, seconds, stats=None, cache=None):
+    """Учитывает запрос; ошибка записи метрик не должна ломать ответ."""
+    try:
+        store_request(request, response, seconds, stats, cache)
+    except OSError:
+        logger.exception('Не удалось записать метрики в %s',
+                         settings.METRICS_DIR)
+
+
+def store_request(request, response, seconds, stats, cache):
+    store = get_store()
+    labels = view_labels(request)
+    store.inc('yamdb_http_requests_total',
+              {**labels, 'status': str(response.status_code)})
+    store.observe('yamdb_http_request_duration_seconds', labels, seconds)
+    if stats is not None:
+        store.inc('yamdb_db_queries_total', labels, stats.query_count)
+        store.inc('yamdb_db_query_duration_seconds_total', labels,
+                  stats.db_time)
+    if cache is not None:
+        store.inc('yamdb_cache_requests_total',
+                  {'view': labels['view'], 'result': cache.lower()})
+
+
+def format_labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'),
+        )
+        for name, value in sorted(labels.items())
+    )
+    return f'{{{pairs}}}'
+
+
+def histogram_lines(name, labels, values):
+    cumulative = 0
+    bounds = [*(str(bound) for bound in LATENCY_BUCKETS), '+Inf']
+    for bound, count in zip(bounds, values):
+        cumulative += count
+        yield f'{name}_bucket{format_labels(labels, le=bound)} {cumulative}'
+    yield f'{name}_sum{format_labels(labels)} {values[-1]}'
+    yield f'{name}_count{format_labels(labels)} {cumulative}'
+
+
+def render(values):
+    """Текстовый формат Prometheus 0.0.4."""
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for key, value in sorted(values.get(name, {}).items()):
+            labels = json.loads(key)
+            if kind == 'histogram':
+                lines.extend(histogram_lines(name, labels, value))
+            else:
+                lines.append(f'{name}{format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
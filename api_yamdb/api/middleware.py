@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+from .cache import CACHE_HEADER
+from .metrics import record_request
+from .replicas import RequestRouting, current_routing
+from .timing import RequestStats, log_slow_request
+
+
+class APIGZipMiddleware(GZipMiddleware):
+    """
+    Сжимает gzip ответы API, которые имеет смысл сжимать: не потоковые,
+    не короче API_GZIP_MIN_SIZE байт и с типом из API_GZIP_CONTENT_TYPES.
+    """
+
+    def should_compress(self, request, response):
+        if response.streaming:
+            return False
+        if not request.path.startswith(settings.API_GZIP_PATH_PREFIX):
+            return False
+        if len(response.content) < settings.API_GZIP_MIN_SIZE:
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0]
+        return content_type.strip() in settings.API_GZIP_CONTENT_TYPES
+
+    def process_response(self, request, response):
+        if not self.should_compress(request, response):
+            return response
+        return super().process_response(request, response)
+
+
+class AsyncCapableMiddleware:
+    """
+    Основа для middleware, работающих и под WSGI, и под ASGI. Под ASGI
+    get_response — корутина, и вызов middleware тоже возвращает
+    корутину (__acall__), чтобы не занимать единственный поток, в котором
+    Django выполняет синхронный код.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так же помечает себя MiddlewareMixin Django.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        self.before(request)
+        return self.after(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        self.before(request)
+        return self.after(request, await self.get_response(request))
+
+    def before(self, request):
+        pass
+
+    def after(self, request, response):
+        return response
+
+
+class RequestTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Считает запросы к базе, время базы, сериализатора, представления
+    и всего запроса. Итоги хранятся в request.stats, а с
+    REQUEST_TIMING_HEADER (для отладки, по умолчанию выключен) — ещё
+    и в заголовке Server-Timing; запросы дольше
+    REQUEST_TIMING_SLOW_MS пишутся в лог api.timing вместе
+    с REQUEST_TIMING_TOP_QUERIES самыми медленными SQL-запросами.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.is_async:
+            # Иначе Django выполнит эти методы в общем синхронном потоке.
+            self.process_view = self.async_process_view
+            self.process_template_response = (
+                self.async_process_template_response)
+
+    def before(self, request):
+        request.stats = RequestStats()
+        request.stats_token = request.stats.start()
+
+    def after(self, request, response):
+        request.stats.stop(request.stats_token)
+        self.finish_view(request)
+        stats = request.stats
+        if settings.REQUEST_TIMING_HEADER:
+            response['Server-Timing'] = stats.server_timing()
+        if stats.total * 1000 >= settings.REQUEST_TIMING_SLOW_MS:
+            log_slow_request(request, response, stats,
+                             settings.REQUEST_TIMING_TOP_QUERIES)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Ответы DRF отрисовываются после этого вызова: время
+        # представления не включает рендеринг.
+        self.finish_view(request)
+        return response
+
+    async def async_process_view(self, request, *args):
+        request.view_started = time.perf_counter()
+
+    async def async_process_template_response(self, request, response):
+        self.finish_view(request)
+        return response
+
+    def finish_view(self, request):
+        started = getattr(request, 'view_started', None)
+        if started is not None:
+            request.stats.add('view', time.perf_counter() - started)
+            request.view_started = None
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Записывает метрики запроса в хранилище api.metrics. Ставится после
+    RequestTimingMiddleware, чтобы взять из request.stats число
+    запросов к базе.
+    """
+
+    def before(self, request):
+        request.metrics_started = time.perf_counter()
+
+    def after(self, request, response):
+        record_request(
+            request, response, time.perf_counter() - request.metrics_started,
+            stats=getattr(request, 'stats', None),
+            cache=response.get(CACHE_HEADER),
+        )
+        return response
+
+
+class ReplicaMiddleware(AsyncCapableMiddleware):
+    """
+    Включает ReplicaRouter на время запроса, если заданы
+    DATABASE_REPLICAS; после записи закрепляет пользователя
+    за основной базой (api/replicas.py).
+    """
+
+    def before(self, request):
+        request.routing = None
+        if settings.DATABASE_REPLICAS:
+            request.routing = RequestRouting(request)
+            request.routing_token = current_routing.set(request.routing)
+
+    def after(self, request, response):
+        if request.routing is not None:
+            current_routing.reset(request.routing_token)
+            request.routing.finish()
+        return response
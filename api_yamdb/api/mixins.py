@@ -1,6 +1,16 @@
-from rest_framework import filters, mixins, viewsets
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import classonlymethod
+from django.utils.functional import cached_property
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from users.validators import validate_username
 
+from .asyncread import async_read_view
+from .cache import bump_version, cached_response
+from .conditional import conditional_response
 from .permissions import IsAdminOrReadOnly
 
 
@@ -20,3 +30,134 @@ class UsernameValidatorMixin:
 
     def username_validation(self, value):
         return validate_username(value)
+
+
+class NestedParentMixin:
+    """
+    Родительский объект вложенного маршрута.
+
+    parent_queryset и parent_lookups ({поле модели: аргумент URL})
+    описывают, как найти родителя; вся цепочка проверяется одним
+    запросом при первом обращении к parent. DRF создаёт экземпляр
+    viewset на каждый запрос, поэтому результат живёт ровно один запрос.
+    """
+
+    parent_queryset = None
+    parent_lookups = {}
+
+    @cached_property
+    def parent(self):
+        return get_object_or_404(self.parent_queryset, **{
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookups.items()
+        })
+
+
+class FastListMixin:
+    """
+    list без сериализатора: строки values() превращает в ответ
+    fast_list_rows (RowRenderer из api/fastread.py). Вывод совпадает
+    с сериализатором; fast_list = False возвращает обычный путь.
+    """
+
+    fast_list = True
+    fast_list_rows = None
+
+    def use_fast_list(self):
+        return self.fast_list and self.fast_list_rows is not None
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list():
+            return super().list(request, *args, **kwargs)
+        rows = self.fast_list_rows()
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(rows.render(queryset))
+        return self.get_paginated_response(rows.render(page))
+
+
+class CachedListMixin:
+    """
+    Кэширует ответы list; cache_resources перечисляет ресурсы,
+    изменение которых должно сбрасывать кэш.
+    """
+
+    cache_resources = ()
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            self, super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedListMixin):
+    """Кэширует ответы list и retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            self, super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """
+    Поддержка ETag для list и retrieve.
+
+    etag_resources — версии ресурсов из кэша, входящие в ETag;
+    etag_from_queryset — добавлять ли к ETag Max(updated_at) и Count(pk).
+    """
+
+    etag_resources = ()
+    etag_from_queryset = True
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_response(
+            self, super().list, request, queryset, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return conditional_response(
+            self, super().retrieve, request, queryset, *args, **kwargs)
+
+
+class BulkCreateMixin:
+    """
+    POST <список>/bulk/ создаёт пачку объектов в одной транзакции.
+
+    bulk_serializer_class — сериализатор элемента, у которого
+    Meta.list_serializer_class проверяет пачку целиком; bulk_resources —
+    ресурсы кэша, которые надо сбросить: bulk_create не шлёт сигналов.
+    """
+
+    bulk_serializer_class = None
+    bulk_resources = ()
+
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    def bulk(self, request):
+        serializer = self.bulk_serializer_class(
+            data=request.data, many=True,
+            context=self.get_serializer_context()
+        )
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        for resource in self.bulk_resources:
+            bump_version(resource)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class AsyncReadMixin:
+    """
+    С API_ASYNC_READS (включается в api_yamdb/asgi.py) представление
+    становится корутиной: чтение выполняется в пуле потоков,
+    запись — синхронно (api/asyncread.py).
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):  # noqa: N805
+        view = super().as_view(actions, **initkwargs)
+        if not settings.API_ASYNC_READS:
+            return view
+        return async_read_view(view)
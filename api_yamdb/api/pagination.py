@@ -0,0 +1,119 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def row_value(row, name):
+    """Значение поля строки: объекта модели или словаря из values()."""
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+class PubDateCursorPagination(LimitOffsetPagination):
+    """
+    Постраничный вывод отзывов и комментариев; страница может состоять
+    из объектов моделей или из словарей values().
+
+    По умолчанию работает как LimitOffsetPagination. С параметром
+    ?pagination=cursor страницы выбираются по ключу (pub_date, id)
+    без OFFSET и без подсчёта COUNT(*).
+    """
+
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    default_mode = 'offset'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def get_mode(self, request):
+        mode = request.query_params.get(
+            self.mode_query_param, self.default_mode)
+        return 'cursor' if mode == 'cursor' else 'offset'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.mode = self.get_mode(request)
+        if self.mode == 'offset':
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.display_page_controls = False
+        cursor = self.decode_cursor(request)
+        backwards = False
+        if cursor is not None:
+            backwards, pub_date, pk = cursor
+            if backwards:
+                queryset = queryset.filter(
+                    Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk))
+            else:
+                queryset = queryset.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk))
+
+        ordering = ('pub_date', 'id') if backwards else ('-pub_date', '-id')
+        rows = list(queryset.order_by(*ordering)[:self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if backwards:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.mode == 'offset':
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_next_link(self):
+        if self.mode == 'offset':
+            return super().get_next_link()
+        if not self.has_next or not self.rows:
+            return None
+        return self.cursor_link(False, self.rows[-1])
+
+    def get_previous_link(self):
+        if self.mode == 'offset':
+            return super().get_previous_link()
+        if not self.has_previous or not self.rows:
+            return None
+        return self.cursor_link(True, self.rows[0])
+
+    def cursor_link(self, backwards, row):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.mode_query_param, 'cursor')
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.cursor_query_param,
+            self.encode_cursor(
+                backwards, row_value(row, 'pub_date'), row_value(row, 'id'))
+        )
+
+    def encode_cursor(self, backwards, pub_date, pk):
+        raw = f'{"r" if backwards else "n"}|{pub_date.isoformat()}|{pk}'
+        return b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = b64decode(encoded.encode('ascii')).decode('utf-8')
+            direction, pub_date, pk = raw.split('|')
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None or direction not in ('n', 'r'):
+            raise NotFound(self.invalid_cursor_message)
+        return direction == 'r', pub_date, pk
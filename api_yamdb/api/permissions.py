@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from .authentication import stored_user
+
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     """
@@ -28,7 +30,7 @@ class IsAuthorOrModeRatOrOrAdminOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.id
             or request.user.is_moderator
             or request.user.is_admin
         )
@@ -37,14 +39,11 @@ class IsAuthorOrModeRatOrOrAdminOrReadOnly(permissions.BasePermission):
 class IsAdminUser(permissions.BasePermission):
     """
     Право на изменение имеет только администратор или
-    суперюзер
+    суперюзер. Роль берётся из базы, а не из токена.
     """
 
     def has_permission(self, request, view):
-        return (
-            request.user.is_authenticated
-            and (
-                request.user.is_superuser
-                or request.user.is_admin
-            )
-        )
+        if not request.user.is_authenticated:
+            return False
+        user = stored_user(request.user)
+        return user is not None and (user.is_superuser or user.is_admin)
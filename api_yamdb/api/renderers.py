@@ -0,0 +1,55 @@
+"""
+JSON-рендерер на orjson.
+
+Вывод совпадает с rest_framework.renderers.JSONRenderer: компактный
+UTF-8 без экранирования кириллицы, U+2028/U+2029 экранируются, даты,
+Decimal и ленивые строки преобразует тот же JSONEncoder DRF. Без orjson,
+а также для отступов (?indent, browsable API) и настроек
+COMPACT_JSON/UNICODE_JSON = False работает обычный рендерер DRF.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer, который использует orjson, если он установлен."""
+
+    encoder_class = JSONEncoder
+
+    def use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.compact and not self.ensure_ascii
+            and self.get_indent(
+                accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self.use_orjson(accepted_media_type, renderer_context):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default,
+            option=ORJSON_OPTIONS,
+        )
+        # Как и в JSONRenderer: эти символы допустимы в JSON,
+        # но не в JavaScript.
+        return ret.replace(
+            '\u2028'.encode('utf-8'), b'\\u2028'
+        ).replace(
+            '\u2029'.encode('utf-8'), b'\\u2029'
+        )
@@ -0,0 +1,113 @@
+"""
+Чтение с реплик базы данных.
+
+ReplicaMiddleware запоминает в contextvar, что обрабатывается запрос,
+а ReplicaRouter отправляет чтения безопасных запросов (GET, HEAD,
+OPTIONS) на одну из реплик DATABASE_REPLICAS. Всё остальное — запись,
+чтения внутри пишущих запросов, команды управления — идёт в default.
+
+Пользователь, который только что записал данные, ещё
+DATABASE_STICKY_SECONDS секунд читает с основной базы, поэтому
+свой новый отзыв он видит сразу, даже если реплика отстаёт. Отметка
+хранится в кэше API и видна всем воркерам. Ответы для общего кэша
+(api/cache.py) всегда читаются с основной базы, иначе отстающая
+реплика попала бы в кэш под новой версией ресурса.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+
+STICKY_KEY = 'db:primary:{}'
+
+current_routing = ContextVar('replica_routing', default=None)
+
+
+def request_user_id(request):
+    """
+    id пользователя запроса, если он уже известен. Ленивого
+    пользователя сессии не вычисляем: это запрос к базе из роутера.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def sticky_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def stick_to_primary(user_id):
+    sticky_cache().set(STICKY_KEY.format(user_id), True,
+                       settings.DATABASE_STICKY_SECONDS)
+
+
+class RequestRouting:
+    """Выбор базы для чтений одного запроса."""
+
+    def __init__(self, request):
+        self.request = request
+        self.primary = request.method not in SAFE_METHODS
+        self.replica = random.choice(settings.DATABASE_REPLICAS)
+        self.sticky = None
+        self.wrote = False
+
+    def db_for_read(self):
+        if self.primary or self.wrote:
+            return DEFAULT_DB_ALIAS
+        if self.sticky is None:
+            user_id = request_user_id(self.request)
+            if user_id is None:
+                # Пользователь ещё не определён (аутентификация DRF
+                # идёт внутри представления) — решим при следующем чтении.
+                return self.replica
+            self.sticky = bool(sticky_cache().get(STICKY_KEY.format(user_id)))
+        return DEFAULT_DB_ALIAS if self.sticky else self.replica
+
+    def finish(self):
+        if self.wrote:
+            user_id = request_user_id(self.request)
+            if user_id is not None:
+                stick_to_primary(user_id)
+
+
+@contextmanager
+def primary_reads():
+    """Чтения внутри блока идут в основную базу."""
+    routing = current_routing.get()
+    if routing is None:
+        yield
+        return
+    primary, routing.primary = routing.primary, True
+    try:
+        yield
+    finally:
+        routing.primary = primary
+
+
+class ReplicaRouter:
+    """Роутер для DATABASE_ROUTERS; без реплик ничего не меняет."""
+
+    def db_for_read(self, model, **hints):
+        routing = current_routing.get()
+        if routing is None:
+            return None
+        return routing.db_for_read()
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # На репликах те же данные, что и в основной базе.
+        return True
@@ -1,17 +1,92 @@
 from django.conf import settings
-from django.core.exceptions import ValidationError
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
-from rest_framework.validators import UniqueTogetherValidator
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 from users.validators import validate_username
 
 from .mixins import UsernameValidatorMixin
+from .timing import TimedSerializerMixin
 from .validators import validate_year
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Проверяет пачку объектов целиком.
+
+    Ошибки возвращаются списком той же длины, что и входные данные:
+    у корректных элементов — пустой словарь. Проверки, которым нужна
+    вся пачка (уникальность, поиск связанных объектов), выполняются
+    в resolve одним запросом на модель.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается список объектов.']
+            })
+        if not data or len(data) > settings.API_BULK_LIMIT:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Количество объектов должно быть от 1 до '
+                    f'{settings.API_BULK_LIMIT}.']
+            })
+        values, errors = [], []
+        for item in data:
+            try:
+                values.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as error:
+                values.append(None)
+                errors.append(error.detail)
+        self.resolve(values, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return values
+
+    def resolve(self, values, errors):
+        pass
+
+
+class SlugBulkListSerializer(BulkListSerializer):
+    """Пакетное создание категорий и жанров."""
+
+    def resolve(self, values, errors):
+        model = self.child.Meta.model
+        slugs = [value['slug'] for value in values if value]
+        taken = set(
+            model.objects.filter(slug__in=slugs).values_list('slug', flat=True)
+        )
+        for value, error in zip(values, errors):
+            if not value:
+                continue
+            if value['slug'] in taken:
+                error['slug'] = [UniqueValidator.message]
+            taken.add(value['slug'])
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create(
+            model(**item) for item in validated_data)
+
+
+class SlugBulkSerializer(serializers.ModelSerializer):
+    """
+    Элемент пачки категорий или жанров; уникальность slug проверяет
+    SlugBulkListSerializer.
+    """
+
+    class Meta:
+        fields = ('name', 'slug')
+        extra_kwargs = {'slug': {'validators': []}}
+        list_serializer_class = SlugBulkListSerializer
+
+
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для категорий."""
 
     class Meta:
@@ -20,7 +95,7 @@ class CategorySerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для жанров."""
 
     class Meta:
@@ -29,6 +104,20 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
+class CategoryBulkSerializer(SlugBulkSerializer):
+    """Элемент пачки категорий."""
+
+    class Meta(SlugBulkSerializer.Meta):
+        model = Category
+
+
+class GenreBulkSerializer(SlugBulkSerializer):
+    """Элемент пачки жанров."""
+
+    class Meta(SlugBulkSerializer.Meta):
+        model = Genre
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериализатор для произведений."""
 
@@ -48,10 +137,85 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def to_representation(self, value):
+        prefetch_related_objects([value], 'genre')
         return TitleReadSerializer(value, context=self.context).data
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleBulkListSerializer(BulkListSerializer):
+    """Пакетное создание произведений вместе со связями с жанрами."""
+
+    does_not_exist = serializers.SlugRelatedField.default_error_messages[
+        'does_not_exist']
+
+    def resolve(self, values, errors):
+        valid = [value for value in values if value]
+        categories = Category.objects.in_bulk(
+            {value['category'] for value in valid}, field_name='slug')
+        genres = Genre.objects.in_bulk(
+            {slug for value in valid for slug in value['genre']},
+            field_name='slug')
+        for value, error in zip(values, errors):
+            if not value:
+                continue
+            for field, found, slugs in (
+                ('category', categories, [value['category']]),
+                ('genre', genres, value['genre']),
+            ):
+                missing = [
+                    self.does_not_exist.format(slug_name='slug', value=slug)
+                    for slug in slugs if slug not in found
+                ]
+                if missing:
+                    error[field] = missing
+            if not error:
+                value['category'] = categories[value['category']]
+                value['genre'] = [genres[slug] for slug in value['genre']]
+
+    def create(self, validated_data):
+        titles = [
+            Title(**{
+                field: value for field, value in item.items()
+                if field != 'genre'
+            })
+            for item in validated_data
+        ]
+        using = router.db_for_write(Title)
+        # SQLite в Django 3.2 не возвращает первичные ключи из bulk_create.
+        if connections[using].features.can_return_rows_from_bulk_insert:
+            Title.objects.using(using).bulk_create(titles)
+        else:
+            for title in titles:
+                title.save(using=using)
+        through = Title.genre.through
+        through.objects.using(using).bulk_create(
+            through(title_id=title.pk, genre_id=genre.pk)
+            for title, item in zip(titles, validated_data)
+            for genre in dict.fromkeys(item['genre'])
+        )
+        prefetch_related_objects(titles, 'genre')
+        return titles
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    """
+    Элемент пачки произведений; категории и жанры по slug ищет
+    TitleBulkListSerializer.
+    """
+
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+    year = serializers.IntegerField(validators=[validate_year])
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'category', 'genre', 'description')
+        list_serializer_class = TitleBulkListSerializer
+
+    def to_representation(self, value):
+        return TitleReadSerializer(value, context=self.context).data
+
+
+class TitleReadSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для произведений."""
 
     category = CategorySerializer(
@@ -71,9 +235,21 @@ class TitleReadSerializer(serializers.ModelSerializer):
         read_only_fields = (
             'id', 'name', 'year', 'genre', 'category', 'description', 'rating',
         )
+        expandable_fields = ('category', 'genre')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get('fieldset')
+        if fieldset is None:
+            return
+        for name in set(self.fields) - set(fieldset.fields):
+            self.fields.pop(name)
+        for name in fieldset.slug_relations(self.Meta.expandable_fields):
+            self.fields[name] = serializers.SlugRelatedField(
+                slug_field='slug', read_only=True, many=name == 'genre')
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Review(оценивания)."""
 
     author = serializers.SlugRelatedField(
@@ -82,23 +258,24 @@ class ReviewSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'author', 'text', 'pub_date', 'score', 'title')
         model = Review
         read_only_fields = ('title',)
 
-    def validate(self, data):
-        if self.context.get('request').method == 'POST':
-            author = self.context.get('request').user
-            title_id = self.context.get('view').kwargs.get('title_id')
-            title = get_object_or_404(Title, id=title_id)
-            if Review.objects.filter(title_id=title.id,
-                                     author=author).exists():
-                raise ValidationError(
-                    'Может существовать только один отзыв!')
-        return data
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique (author, title):
+        # проверка заранее не защищает от параллельных запросов.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Может существовать только один отзыв!']
+            })
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор для модели Comment(Комментирования)."""
 
     author = serializers.SlugRelatedField(
@@ -107,12 +284,13 @@ class CommentSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'author', 'text', 'pub_date', 'review')
         model = Comment
         read_only_fields = ('review',)
 
 
-class UserSerializer(serializers.ModelSerializer, UsernameValidatorMixin):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer,
+                     UsernameValidatorMixin):
     """Сериализатор для модели пользователей."""
 
     class Meta:
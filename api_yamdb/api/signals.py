@@ -0,0 +1,50 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+from .authentication import forget_user
+from .cache import bump_version
+
+CACHED_RESOURCES = {
+    Category: 'category',
+    Genre: 'genre',
+    Title: 'title',
+    Review: 'review',
+    # Имя автора входит в ответы с отзывами и комментариями.
+    User: 'user',
+}
+
+
+def after_commit(func, *args, using=None):
+    """
+    Вызывает func после фиксации транзакции записи (или сразу вне
+    транзакции). Если сбросить кэш раньше, параллельный читатель успеет
+    сохранить старые строки под новой версией.
+    """
+    transaction.on_commit(partial(func, *args), using=using)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_resource_version(sender, using=None, **kwargs):
+    """Сбрасывает кэш ответов, зависящих от изменённой модели."""
+    resource = CACHED_RESOURCES.get(sender)
+    if resource is not None:
+        after_commit(bump_version, resource, using=using)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genres_version(sender, action, using=None, **kwargs):
+    if action.startswith('post_'):
+        after_commit(bump_version, 'title', using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, using=None, **kwargs):
+    """Удаляет пользователя из кэша JWT-аутентификации."""
+    after_commit(forget_user, instance.pk, using=using)
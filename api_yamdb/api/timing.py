@@ -0,0 +1,153 @@
+"""
+Замеры времени обработки запроса.
+
+RequestStats собирает запросы к базе и время именованных участков
+(timed): сериализатора и представления. Статистика текущего запроса
+доступна через contextvar, поэтому участки можно отмечать в любом месте
+кода, не передавая запрос; contextvar переходит и в потоки sync_to_async,
+так что запросы из пула потоков ASGI тоже учитываются. Вложенные
+участки с тем же именем не учитываются дважды.
+"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+current_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Запросы к базе и время участков одного HTTP-запроса."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.queries = []
+        self.timings = {}
+        self.active = set()
+
+    def start(self):
+        """Делает статистику текущей; возвращает токен для stop."""
+        for connection in connections.all():
+            watch_connection(connection)
+        return current_stats.set(self)
+
+    def stop(self, token):
+        current_stats.reset(token)
+        self.finished = time.perf_counter()
+
+    @contextmanager
+    def collect(self):
+        token = self.start()
+        try:
+            yield self
+        finally:
+            self.stop(token)
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0) + seconds
+
+    @property
+    def total(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    @property
+    def db_time(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def slowest(self, count):
+        return sorted(self.queries, key=lambda query: -query[1])[:count]
+
+    def server_timing(self):
+        metrics = [
+            f'db;dur={self.db_time * 1000:.2f};'
+            f'desc="{self.query_count} queries"'
+        ]
+        metrics.extend(
+            f'{name};dur={seconds * 1000:.2f}'
+            for name, seconds in self.timings.items()
+        )
+        metrics.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(metrics)
+
+    def as_log(self, top):
+        return {
+            'duration_ms': round(self.total * 1000, 2),
+            'queries': self.query_count,
+            'db_ms': round(self.db_time * 1000, 2),
+            **{
+                f'{name}_ms': round(seconds * 1000, 2)
+                for name, seconds in self.timings.items()
+            },
+            'slowest_queries': [
+                {'sql': sql, 'ms': round(seconds * 1000, 2)}
+                for sql, seconds in self.slowest(top)
+            ],
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries.append((sql, time.perf_counter() - started))
+
+
+def watch_connection(connection, **kwargs):
+    """
+    Подключает record_query к соединению; вызывается и по сигналу
+    connection_created, поэтому учитываются соединения любых потоков.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timed(name):
+    """Добавляет время блока к участку name текущего запроса."""
+    stats = current_stats.get()
+    if stats is None or name in stats.active:
+        yield
+        return
+    stats.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.active.discard(name)
+        stats.add(name, time.perf_counter() - started)
+
+
+def log_slow_request(request, response, stats, top):
+    record = {
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'view': getattr(request.resolver_match, 'view_name', None),
+        **stats.as_log(top),
+    }
+    logger.warning(
+        'slow request %s', json.dumps(record, ensure_ascii=False),
+        extra={'request_stats': record},
+    )
+
+
+class TimedSerializerMixin:
+    """Учитывает вывод сериализатора в участке serializer."""
+
+    def to_representation(self, instance):
+        with timed('serializer'):
+            return super().to_representation(instance)
@@ -1,7 +1,7 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
+from .views import (CategoryViewSet, CommentViewSet, ExportView, GenreViewSet,
                     ReviewViewSet, TitlesViewSet, UserSignInView,
                     UserSignUpView, UserViewSet)
 
@@ -27,5 +27,9 @@ urlpatterns = [
             path('signup/', UserSignUpView.as_view(), name='user_signup'),
             path('token/', UserSignInView.as_view(), name='user_signin')
         ]
-    ))
+    )),
+    re_path(
+        r'^v1/export/(?P<name>\w+)\.(?P<fmt>csv|ndjson)$',
+        ExportView.as_view(), name='export'
+    ),
 ]
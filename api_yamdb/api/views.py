@@ -1,82 +1,166 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Prefetch
 from django.db.utils import IntegrityError
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
+from reviews.export import EXPORT_HANDLE, FORMATS, export_lines
 from reviews.models import Category, Genre, Review, Title
 from users.models import User
+from users.outbox import enqueue_mail
 
-from .filters import TitleFilter
-from .mixins import ListCreateDestroyGenericViewSet
+from . import metrics
+from .authentication import get_access_token
+from .fastread import CommentRows, ReviewRows, TitleRows
+from .fieldsets import get_fieldset
+from .filters import TitleFilter, TitleSearchFilter
+from .mixins import (AsyncReadMixin, BulkCreateMixin, CachedListMixin,
+                     CachedRetrieveMixin, ConditionalGetMixin, FastListMixin,
+                     ListCreateDestroyGenericViewSet, NestedParentMixin)
+from .pagination import PubDateCursorPagination
 from .permissions import (IsAdminOrReadOnly, IsAdminUser,
                           IsAuthorOrModeRatOrOrAdminOrReadOnly)
-from .serializers import (CategorySerializer, CommentSerializer,
+from .serializers import (CategoryBulkSerializer, CategorySerializer,
+                          CommentSerializer, GenreBulkSerializer,
                           GenreSerializer, ReviewSerializer,
-                          TitleReadSerializer, TitleWriteSerializer,
-                          TokenSerializer, UserPermissionsSerializer,
-                          UserSerializer, UserSignUpSerializer)
+                          TitleBulkSerializer, TitleReadSerializer,
+                          TitleWriteSerializer, TokenSerializer,
+                          UserPermissionsSerializer, UserSerializer,
+                          UserSignUpSerializer)
 
 
-class CategoryViewSet(ListCreateDestroyGenericViewSet):
+class CategoryViewSet(AsyncReadMixin, BulkCreateMixin, CachedListMixin,
+                      ListCreateDestroyGenericViewSet):
     """ViewSet класс для категорий."""
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    bulk_serializer_class = CategoryBulkSerializer
+    cache_resources = ('category',)
+    bulk_resources = cache_resources
 
 
-class GenreViewSet(ListCreateDestroyGenericViewSet):
+class GenreViewSet(AsyncReadMixin, BulkCreateMixin, CachedListMixin,
+                   ListCreateDestroyGenericViewSet):
     """ViewSet класс для жанров."""
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    bulk_serializer_class = GenreBulkSerializer
+    cache_resources = ('genre',)
+    bulk_resources = cache_resources
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitlesViewSet(AsyncReadMixin, BulkCreateMixin, ConditionalGetMixin,
+                    CachedRetrieveMixin, FastListMixin, viewsets.ModelViewSet):
     """ViewSet класс для произведений."""
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score'))
+    queryset = Title.objects.select_related(
+        'category').prefetch_related('genre')
     permission_classes = [IsAdminOrReadOnly]
+    filter_backends = (
+        *api_settings.DEFAULT_FILTER_BACKENDS, TitleSearchFilter
+    )
     filterset_class = TitleFilter
     ordering = ('name',)
+    bulk_serializer_class = TitleBulkSerializer
+    fast_list_rows = TitleRows
+    bulk_resources = ('title',)
+    cache_resources = ('title', 'category', 'genre', 'review')
+    etag_resources = cache_resources
+    etag_from_queryset = False
 
     def get_serializer_class(self):
         if self.action in ('create', 'update', 'partial_update'):
             return TitleWriteSerializer
         return TitleReadSerializer
 
+    @cached_property
+    def fieldset(self):
+        if self.action not in ('list', 'retrieve'):
+            return None
+        return get_fieldset(
+            self.request, TitleReadSerializer.Meta.fields,
+            TitleReadSerializer.Meta.expandable_fields
+        )
+
+    def get_queryset(self):
+        fieldset = self.fieldset
+        if fieldset is None:
+            return super().get_queryset()
+        queryset = Title.objects.all()
+        columns = [
+            name for name in fieldset.fields
+            if name not in TitleReadSerializer.Meta.expandable_fields
+        ]
+        if 'category' in fieldset.fields:
+            queryset = queryset.select_related('category')
+            columns += ['category', 'category__slug']
+            if 'category' in fieldset.expand:
+                columns.append('category__name')
+        if 'genre' in fieldset.fields:
+            genre_columns = ['slug']
+            if 'genre' in fieldset.expand:
+                genre_columns.append('name')
+            queryset = queryset.prefetch_related(Prefetch(
+                'genre', queryset=Genre.objects.only(*genre_columns)))
+        return queryset.only('id', *columns)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.fieldset
+        return context
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def use_fast_list(self):
+        return self.fieldset is None and super().use_fast_list()
+
+
+class ReviewViewSet(AsyncReadMixin, NestedParentMixin, ConditionalGetMixin,
+                    FastListMixin, viewsets.ModelViewSet):
     """ViewSet класс для модели Отзывов."""
     serializer_class = ReviewSerializer
+    # Переименование автора меняет ответ, но не updated_at.
+    etag_resources = ('user',)
+    fast_list_rows = ReviewRows
     permission_classes = [IsAuthorOrModeRatOrOrAdminOrReadOnly]
+    pagination_class = PubDateCursorPagination
+    parent_queryset = Title.objects.all()
+    parent_lookups = {'pk': 'title_id'}
 
     def get_titles(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        return self.parent
 
     def get_queryset(self):
-        return self.get_titles().reviews.all()
+        return self.get_titles().reviews.select_related('author')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_titles())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(AsyncReadMixin, NestedParentMixin, ConditionalGetMixin,
+                     FastListMixin, viewsets.ModelViewSet):
     """ViewSet класс для модели Комментариев."""
     serializer_class = CommentSerializer
+    # Переименование автора меняет ответ, но не updated_at.
+    etag_resources = ('user',)
+    fast_list_rows = CommentRows
     permission_classes = [IsAuthorOrModeRatOrOrAdminOrReadOnly]
+    pagination_class = PubDateCursorPagination
+    parent_queryset = Review.objects.select_related('title')
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
 
     def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get('review_id'))
+        return self.parent
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
@@ -123,8 +207,20 @@ class UserSignUpView(APIView):
         username = serializer.validated_data.get('username')
         email = serializer.validated_data.get('email')
         try:
-            user, _ = User.objects.get_or_create(
-                username=username, email=email)
+            with transaction.atomic():
+                user, _ = User.objects.get_or_create(
+                    username=username, email=email)
+                confirmation_code = default_token_generator.make_token(user)
+                enqueue_mail(
+                    message=(
+                        f'Здравствуйте, {user.username}! '
+                        'Ваш код подтверждения регистрации: '
+                        f'{confirmation_code}'
+                    ),
+                    subject='Сonfirmation code',
+                    recipient_list=[user.email],
+                    from_email=settings.EMAIL_NO_REPLY
+                )
         except IntegrityError:
             sign_up_error = (
                 EMAIL_VALIDATE_ERROR
@@ -135,16 +231,6 @@ class UserSignUpView(APIView):
                 sign_up_error,
                 status=status.HTTP_400_BAD_REQUEST
             )
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(
-            message=(
-                f'Здравствуйте, {user.username}! '
-                f'Ваш код подтверждения регистрации: {confirmation_code}'
-            ),
-            subject='Сonfirmation code',
-            recipient_list=[user.email],
-            from_email=settings.EMAIL_NO_REPLY
-        )
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
@@ -160,9 +246,36 @@ class UserSignInView(APIView):
             'confirmation_code')
         if default_token_generator.check_token(user, confirmation_code):
             return Response(
-                {'token': str(AccessToken.for_user(user))},
+                {'token': str(get_access_token(user))},
                 status=status.HTTP_201_CREATED
             )
         return Response(
             'Неверный confirmation_code', status=status.HTTP_400_BAD_REQUEST
         )
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка таблицы в формате import_data."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, name, fmt):
+        if name not in EXPORT_HANDLE:
+            raise Http404
+        response = StreamingHttpResponse(
+            export_lines(name, fmt), content_type=FORMATS[fmt]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{fmt}"'
+        )
+        return response
+
+
+class MetricsView(APIView):
+    """Метрики всех воркеров в текстовом формате Prometheus."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            metrics.render(metrics.get_store().collect()),
+            content_type=metrics.CONTENT_TYPE,
+        )
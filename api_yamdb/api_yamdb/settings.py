@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -35,7 +36,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestTimingMiddleware',
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.APIGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -83,6 +88,61 @@ DATABASES = {
 
 DATABASES['default'] = DATABASES['test' if DEBUG_SQLITE else 'prod']
 
+# Реплики только для чтения: DB_REPLICA_HOSTS=host1,host2.
+DATABASE_REPLICAS = []
+if not DEBUG_SQLITE:
+    for number, host in enumerate(
+            filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), 1):
+        alias = f'replica{number}'
+        DATABASES[alias] = {
+            **DATABASES['prod'],
+            'HOST': host.strip(),
+            'TEST': {'MIRROR': 'default'},
+        }
+        DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+# Сколько секунд после записи пользователь читает с основной базы.
+DATABASE_STICKY_SECONDS = int(os.getenv('DB_STICKY_SECONDS', 10))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'yamdb'),
+    }
+}
+
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+
+# Сжатие ответов API: короткие ответы не сжимаются, сжатие им не выгодно.
+API_GZIP_MIN_SIZE = int(os.getenv('API_GZIP_MIN_SIZE', 1024))
+API_GZIP_PATH_PREFIX = '/api/'
+API_GZIP_CONTENT_TYPES = ('application/json',)
+
+# Включается в api_yamdb/asgi.py: чтение в пуле потоков (api/asyncread.py).
+API_ASYNC_READS = os.getenv('API_ASYNC_READS', 'False') == 'True'
+
+REQUEST_TIMING_HEADER = os.getenv('REQUEST_TIMING_HEADER', 'False') == 'True'
+REQUEST_TIMING_SLOW_MS = int(os.getenv('REQUEST_TIMING_SLOW_MS', 500))
+REQUEST_TIMING_TOP_QUERIES = int(os.getenv('REQUEST_TIMING_TOP_QUERIES', 5))
+
+METRICS_DIR = os.getenv(
+    'METRICS_DIR', os.path.join(tempfile.gettempdir(), 'yamdb_metrics'))
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.timing': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -125,7 +185,7 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -134,6 +194,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10
 }
@@ -142,6 +206,10 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=180),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# Сколько секунд пользователь из JWT хранится в кэше API.
+JWT_USER_CACHE_TIMEOUT = int(os.getenv('JWT_USER_CACHE_TIMEOUT', 300))
+# Доверять роли из токена в безопасных запросах, не загружая пользователя.
+JWT_TRUST_ROLE_CLAIMS = os.getenv('JWT_TRUST_ROLE_CLAIMS', 'False') == 'True'
 
 CSV_FILE_PATH = os.path.join(BASE_DIR, 'static/data')
 
@@ -157,3 +225,6 @@ FIELD_LIMIT = {
     'name': 256,
     'confirmation_code': 50
 }
+
+# Наибольшее число объектов в одном запросе к /bulk/.
+API_BULK_LIMIT = int(os.getenv('API_BULK_LIMIT', 1000))
@@ -0,0 +1,14 @@
+"""
+Настройки gunicorn: файл читается из рабочего каталога автоматически.
+
+Перед запуском воркеров очищается каталог метрик METRICS_DIR, чтобы
+/metrics не складывал файлы воркеров прежнего запуска.
+"""
+import os
+
+
+def on_starting(server):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    from api.metrics import clear_metrics
+
+    clear_metrics()
@@ -19,7 +19,8 @@ class GenreTitleInline(admin.TabularInline):
 
 class TitleAdmin(admin.ModelAdmin):
     list_display = (
-        'id', 'name', 'year', 'category', 'description', 'show_genre'
+        'id', 'name', 'year', 'category', 'description', 'show_genre',
+        'rating',
     )
     search_fields = ('name', 'description',)
     list_filter = ('year', 'category', 'genre',)
@@ -7,7 +7,7 @@ class BaseModelGenreCategory(models.Model):
     """Абстрактная модель для жанров и категорий."""
 
     name = models.CharField(
-        'Название', max_length=settings.FIELD_LIMIT['name'])
+        'Название', max_length=settings.FIELD_LIMIT['name'], db_index=True)
     slug = models.SlugField(
         'Ссылка', max_length=settings.FIELD_LIMIT['slug'], unique=True)
 
@@ -24,6 +24,7 @@ class BaseModelReviewComment(models.Model):
     text = models.TextField('Текст отзыва')
     pub_date = models.DateTimeField(
         'Дата публикации', auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -0,0 +1,42 @@
+"""
+Для запуска программы введите команду python manage.py export_data.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from reviews.export import (DEFAULT_CHUNK_SIZE, EXPORT_HANDLE, FORMATS,
+                            export_lines)
+
+
+class Command(BaseCommand):
+    help = 'Dumps the database into csv-files readable by import_data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=settings.CSV_FILE_PATH,
+            help='Directory to write files into')
+        parser.add_argument(
+            '--format', choices=tuple(FORMATS), default='csv',
+            dest='fmt', help='Output format')
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Rows fetched from the database per round trip')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database alias to read from')
+
+    def handle(self, *args, **options):
+        directory = Path(options['path'])
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in EXPORT_HANDLE:
+            file_path = directory / f'{name}.{options["fmt"]}'
+            lines = 0
+            with open(file_path, 'w', encoding='utf8', newline='') as f:
+                for line in export_lines(name, options['fmt'],
+                                         options['chunk_size'],
+                                         options['database']):
+                    f.write(line)
+                    lines += 1
+            self.stdout.write(f'Выгружено в {file_path}: строк {lines}')
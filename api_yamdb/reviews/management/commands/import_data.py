@@ -1,55 +1,570 @@
 """
 Для запуска программы введите команду python manage.py import_data.
+
+Файлы читаются построчно и записываются пачками по --chunk-size строк,
+поэтому расход памяти не зависит от размера файла.
 """
 import csv
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from itertools import islice
 from pathlib import Path
 
-from django.core.management import BaseCommand
+import django
+from api.cache import bump_version
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
+FILE_HANDLE = (
+    ('category.csv', Category, {}, ()),
+    ('genre.csv', Genre, {}, ()),
+    ('users.csv', User, {}, ()),
+    ('titles.csv', Title, {'category': 'category_id'}, ('category.csv',)),
+    ('genre_title.csv', Title.genre.through, {},
+     ('titles.csv', 'genre.csv')),
+    ('review.csv', Review, {'author': 'author_id'},
+     ('titles.csv', 'users.csv')),
+    ('comments.csv', Comment, {'author': 'author_id'},
+     ('review.csv', 'users.csv')),
+)
+# Строки этих файлов независимы между разными значениями ключа,
+# поэтому в режиме --workers файл делится на части по ключу.
+PARTITION_KEYS = {
+    'review.csv': 'title_id',
+    'comments.csv': 'review_id',
+}
+CACHED_RESOURCES = ('category', 'genre', 'title', 'review')
+MAX_REPORTED_ERRORS = 10
+# Значений в одном условии IN: меньше лимита параметров SQLite.
+MAX_IN_LIST = 900
+
+
+class RowError(Exception):
+    """Строка csv-файла не может быть преобразована в объект модели."""
+
+
+class RowErrors:
+    """Счётчик ошибочных строк с несколькими примерами для отчёта."""
+
+    def __init__(self, limit=MAX_REPORTED_ERRORS):
+        self.count = 0
+        self.limit = limit
+        self.samples = []
+
+    def add(self, line, message):
+        self.count += 1
+        if len(self.samples) < self.limit:
+            self.samples.append((line, message))
+
+
+def read_rows(path):
+    """Построчно отдаёт номер строки файла и словарь значений."""
+    with open(path, mode='r', encoding='utf8', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def partition(rows, key, shard, shards):
+    """Оставляет строки, у которых значение key попадает в часть shard."""
+    for line, row in rows:
+        try:
+            owner = int(row[key]) % shards
+        except (KeyError, TypeError, ValueError):
+            owner = 0
+        if owner == shard:
+            yield line, row
+
+
+def get_converters(model, header, replace):
+    converters = {}
+    for column in header:
+        name = replace.get(column, column)
+        try:
+            converters[column] = (name, model._meta.get_field(name))
+        except FieldDoesNotExist:
+            raise CommandError(
+                f'Неверный заголовок в csv-файле: поле {column} '
+                f'отсутствует в модели {model.__name__}.')
+    return converters
+
+
+def is_required(field):
+    """Поле NOT NULL без значения по умолчанию: пустым его не оставить."""
+    return not (
+        field.null or field.primary_key or field.get_default() is not None
+        or getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    )
+
+
+def build_object(model, converters, row, dates=()):
+    """
+    Объект модели из строки файла. Поля dates (auto_now_add) без значения
+    получают текущее время: при вставке auto_now_add отключён.
+    """
+    if None in row:
+        # DictReader складывает значения сверх заголовка под ключ None.
+        raise RowError(f'лишние значения: {row[None]!r}')
+    values = {}
+    for column, value in row.items():
+        name, field = converters[column]
+        # В короткой строке у последних столбцов значение None.
+        if value is None or (value == '' and field.null):
+            value = None
+        else:
+            try:
+                value = field.to_python(value)
+            except ValidationError as error:
+                raise RowError(
+                    f'{column}={value!r}: {"; ".join(error.messages)}')
+        if value is None and is_required(field):
+            raise RowError(f'{column}: нет обязательного значения')
+        values[name] = value
+    for name in dates:
+        if values.get(name) is None:
+            values[name] = timezone.now()
+    return model(**values)
+
+
+def build_objects(model, replace, rows, errors):
+    """
+    Превращает строки в пары (номер строки, объект модели); ошибочные
+    строки учитывает в errors и пропускает.
+    """
+    converters = None
+    dates = [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for line, row in rows:
+        if converters is None:
+            converters = get_converters(model, row.keys(), replace)
+        try:
+            yield line, build_object(model, converters, row, dates)
+        except RowError as error:
+            errors.add(line, str(error))
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+@contextmanager
+def explicit_dates(*models):
+    """
+    Отключает auto_now_add у полей моделей: bulk_create пишет даты
+    из данных, а не подменяет их текущим временем.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def existing_ids(model, ids, using, field='pk'):
+    """Какие из значений ids уже есть в столбце field таблицы модели."""
+    found = set()
+    for part in chunked(ids, MAX_IN_LIST):
+        found.update(
+            model._base_manager.using(using)
+            .filter(**{f'{field}__in': part})
+            .values_list(field, flat=True)
+        )
+    return found
+
+
+def check_references(model, chunk, errors, using):
+    """
+    Отбрасывает строки пачки, которые ссылаются на несуществующие
+    объекты: иначе внешний ключ не даст зафиксировать весь файл.
+    """
+    for field in model._meta.concrete_fields:
+        if not field.many_to_one:
+            continue
+        target = field.target_field
+        values = {getattr(obj, field.attname) for _, obj in chunk} - {None}
+        found = existing_ids(target.model, values, using, target.attname)
+        kept = []
+        for line, obj in chunk:
+            value = getattr(obj, field.attname)
+            if value is None or value in found:
+                kept.append((line, obj))
+            else:
+                errors.add(line, f'{field.name}={value}: объект '
+                                 f'{target.model.__name__} не найден')
+        chunk = kept
+    return [obj for _, obj in chunk]
+
+
+def natural_key(model):
+    """
+    Поля, по которым видно, что строка без первичного ключа уже есть
+    в таблице: уникальное поле или уникальный набор полей. Пустой
+    кортеж — кроме первичного ключа, конфликтовать не по чему.
+    """
+    for field in model._meta.concrete_fields:
+        if field.unique and not field.primary_key:
+            return (field.attname,)
+    for fields in model._meta.unique_together:
+        return tuple(model._meta.get_field(name).attname for name in fields)
+    for constraint in model._meta.total_unique_constraints:
+        return tuple(
+            model._meta.get_field(name).attname
+            for name in constraint.fields
+        )
+    return ()
+
+
+def existing_keys(model, fields, keys, using):
+    """Какие из наборов значений keys полей fields уже есть в таблице."""
+    found = set()
+    for part in chunked({key[0] for key in keys}, MAX_IN_LIST):
+        found.update(
+            model._base_manager.using(using)
+            .filter(**{f'{fields[0]}__in': part})
+            .values_list(*fields)
+        )
+    return found & keys
+
+
+def insert_chunk(model, objects, batch_size, using):
+    """
+    Записывает пачку и возвращает число действительно добавленных строк:
+    строки, уже существующие по уникальным полям, пропускаются. Новые
+    строки считаются по ключам пачки, а не по размеру таблицы, поэтому
+    счёт верен и при параллельной загрузке частей файла.
+    """
+    manager = model.objects.using(using)
+    ids = [obj.pk for obj in objects if obj.pk is not None]
+    fields = natural_key(model) if len(ids) < len(objects) else ()
+    if fields:
+        keys = {
+            tuple(getattr(obj, field) for field in fields)
+            for obj in objects
+        }
+        existed = existing_keys(model, fields, keys, using)
+        manager.bulk_create(objects, batch_size=batch_size,
+                            ignore_conflicts=True)
+        return len(existing_keys(model, fields, keys, using) - existed)
+    # Строки без первичного ключа здесь ни с чем не конфликтуют.
+    existed = existing_ids(model, ids, using)
+    manager.bulk_create(objects, batch_size=batch_size, ignore_conflicts=True)
+    return len(objects) - len(ids) + len(
+        existing_ids(model, ids, using) - existed)
+
+
+# Определения индексов таблицы: их имена и SQL, которым они созданы.
+INDEX_DEFINITIONS = {
+    'postgresql': (
+        'SELECT indexname, indexdef FROM pg_indexes '
+        'WHERE schemaname = current_schema() AND tablename = %s'
+    ),
+    'sqlite': (
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL"
+    ),
+}
+
+
+def secondary_indexes(model, using):
+    """
+    Обычные (не уникальные) btree-индексы таблицы модели с SQL, которым
+    они созданы. По нему индекс восстанавливается как был — с классом
+    операторов (*_like в PostgreSQL), порядком и условием.
+    """
+    connection = connections[using]
+    if connection.vendor not in INDEX_DEFINITIONS:
+        return []
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+        cursor.execute(INDEX_DEFINITIONS[connection.vendor], [table])
+        definitions = dict(cursor.fetchall())
+    return [
+        (name, definitions[name])
+        for name, info in constraints.items()
+        if info['index'] and not info['unique'] and not info['primary_key']
+        and info['columns'] and None not in info['columns']
+        and info.get('type') in ('btree', 'idx') and name in definitions
+    ]
+
+
+def drop_indexes(model, using):
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    indexes = secondary_indexes(model, using)
+    with connection.cursor() as cursor:
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {quote(name)}')
+    return indexes
+
+
+def create_indexes(using, indexes):
+    with connections[using].cursor() as cursor:
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+
+def load_file(rows, model, replace, chunk_size, batch_size, using,
+              defer_indexes=False, report=None):
+    """
+    Загружает строки файла пачками и возвращает
+    (добавлено строк, секунд, RowErrors). Вызывающий код отвечает
+    за транзакцию.
+    """
+    errors = RowErrors()
+    indexes = drop_indexes(model, using) if defer_indexes else []
+    started = time.monotonic()
+    processed = added = 0
+    try:
+        objects = build_objects(model, replace, rows, errors)
+        with explicit_dates(model):
+            for chunk in chunked(objects, chunk_size):
+                processed += len(chunk)
+                chunk = check_references(model, chunk, errors, using)
+                added += insert_chunk(model, chunk, batch_size, using)
+                if report is not None:
+                    report(processed, time.monotonic() - started)
+    finally:
+        if indexes:
+            create_indexes(using, indexes)
+    return added, time.monotonic() - started, errors
+
+
+def reset_sequences(models, using):
+    """
+    Сдвигает счётчики первичных ключей за загруженные значения: ключи
+    в файлах заданы явно, и без этого первая вставка через API получит
+    уже занятый id (PostgreSQL). В SQLite запросов нет.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+
+
+def check_errors(file, errors, strict):
+    if errors.count and strict:
+        raise CommandError(
+            f'В файле {file} ошибочных строк: {errors.count}. '
+            'Импорт отменен.')
+
+
+def atomic(enabled, using):
+    return transaction.atomic(using) if enabled else nullcontext()
+
+
+@contextmanager
+def write_transaction(using):
+    """
+    transaction.atomic, который в SQLite сразу берёт блокировку записи
+    (BEGIN IMMEDIATE). Части файла сначала читают (check_references),
+    и две обычные транзакции, начавшие с чтения, не могут обе перейти
+    к записи — SQLite сразу отвечает «database is locked», не дожидаясь
+    timeout. BEGIN IMMEDIATE ждёт освобождения блокировки.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        with transaction.atomic(using):
+            yield
+        return
+
+    def begin_immediate():
+        connection.cursor().execute('BEGIN IMMEDIATE')
+
+    # Этим методом atomic начинает транзакцию в SQLite.
+    connection._start_transaction_under_autocommit = begin_immediate
+    try:
+        with transaction.atomic(using):
+            yield
+    finally:
+        del connection._start_transaction_under_autocommit
+
+
+def init_worker():
+    if not apps.ready:
+        django.setup()
+
+
+def import_stage(file, csv_dir, shard, shards, options):
+    """
+    Загружает файл или его часть shard из shards в отдельном процессе.
+    У каждого процесса своё соединение и своя транзакция.
+    """
+    _, model, replace, _ = next(
+        handle for handle in FILE_HANDLE if handle[0] == file)
+    rows = read_rows(Path(csv_dir, file))
+    if shards > 1:
+        rows = partition(rows, PARTITION_KEYS[file], shard, shards)
+    using = options['database']
+    try:
+        with write_transaction(using):
+            total, seconds, errors = load_file(
+                rows, model, replace, options['chunk_size'],
+                options['batch_size'], using)
+            check_errors(file, errors, options['strict'])
+    finally:
+        connections[using].close()
+    return file, shard, total, seconds, errors
+
 
 class Command(BaseCommand):
-    help = 'Fills the database with data from csv-file in static folder'
-
-    def handle(self, *args, **kwargs):
-        CSV_DIR = Path('static', 'data')
-        FILE_HANDLE = (
-            ('category.csv', Category, {}),
-            ('genre.csv', Genre, {}),
-            ('users.csv', User, {}),
-            ('titles.csv', Title, {'category': 'category_id'}),
-            ('genre_title.csv', Title.genre.through, {}),
-            ('review.csv', Review, {'author': 'author_id'}),
-            ('comments.csv', Comment, {'author': 'author_id'}),
+    help = 'Fills the database with data from csv-files in static folder'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=settings.CSV_FILE_PATH,
+            help='Directory with csv-files')
+        parser.add_argument(
+            '--chunk-size', type=int, default=10000,
+            help='Rows read into memory and written per bulk_create call')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows per INSERT statement')
+        parser.add_argument(
+            '--atomic', choices=('file', 'run'), default='file',
+            help='One transaction per file or for the whole run')
+        parser.add_argument(
+            '--strict', action='store_true',
+            help='Roll back the import if a file has broken rows')
+        parser.add_argument(
+            '--defer-indexes', action='store_true',
+            help='Drop secondary indexes while loading and rebuild them after')
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Load independent files and partitions in N processes')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database alias to load into')
+
+    def handle(self, *args, **options):
+        csv_dir = Path(options['path'])
+        using = options['database']
+        handles = []
+        for handle in FILE_HANDLE:
+            if (csv_dir / handle[0]).exists():
+                handles.append(handle)
+            else:
+                self.stderr.write(f'Файл {csv_dir / handle[0]} не найден')
+        models = [model for _, model, _, _ in handles]
+        if options['workers'] > 1:
+            if options['atomic'] == 'run':
+                raise CommandError(
+                    '--atomic=run несовместим с --workers: у каждого '
+                    'процесса своя транзакция.')
+            self.import_parallel(csv_dir, handles, options)
+            reset_sequences(models, using)
+            updated = Title.objects.using(using).rebuild_ratings()
+        else:
+            run_atomic = options['atomic'] == 'run'
+            with atomic(run_atomic, using):
+                for file, model, replace, _ in handles:
+                    self.stdout.write(f'{"---"*40}\nИмпорт из файла {file}')
+                    with atomic(not run_atomic, using):
+                        self.import_file(csv_dir / file, model, replace,
+                                         options)
+                reset_sequences(models, using)
+                updated = Title.objects.using(using).rebuild_ratings()
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
+        for resource in CACHED_RESOURCES:
+            bump_version(resource)
+
+    def import_file(self, file_path, model, replace, options):
+        def report(total, seconds):
+            self.stdout.write(
+                f'  {file_path.name}: обработано строк {total}, '
+                f'{total / max(seconds, 1e-9):.0f} строк/с')
+
+        total, seconds, errors = load_file(
+            read_rows(file_path), model, replace,
+            chunk_size=options['chunk_size'],
+            batch_size=options['batch_size'],
+            using=options['database'],
+            defer_indexes=options['defer_indexes'],
+            report=report,
         )
-        for file, model, replace in FILE_HANDLE:
-            self.stdout.write(f'Начинаем импорт из файла {file}')
-            self.stdout.write(f'{"---"*40}\n открываем файл {file}')
-            file_path = Path('static', 'data', file)
-            if not file_path.exists():
-                self.stderr.write(f'Файл {file} не найден')
-                continue
-            with open(Path(CSV_DIR, file), mode='r', encoding='utf8') as f:
-                reader = csv.DictReader(f)
-                counter = 0
-                objects_to_create = []
-                for row in reader:
-                    counter += 1
-                    args = dict(**row)
-                    if replace:
-                        for old, new in replace.items():
-                            args[new] = args.pop(old)
-                    try:
-                        objects_to_create.append(model(**args))
-                    except TypeError:
-                        self.stderr.write('Неверный заголовок в csv-файле.')
-                        break
-                try:
-                    model.objects.bulk_create(objects_to_create,
-                                              ignore_conflicts=True)
+        self.report_file(file_path.name, total, seconds, errors)
+        check_errors(file_path.name, errors, options['strict'])
+
+    def report_file(self, file, total, seconds, errors):
+        for line, message in errors.samples:
+            self.stderr.write(f'  {file}, строка {line}: {message}')
+        self.stdout.write(
+            f'{file}: добавлено объектов: {total}; '
+            f'пропущено строк: {errors.count}; '
+            f'{seconds:.2f} с, {total / max(seconds, 1e-9):.0f} строк/с')
+
+    def import_parallel(self, csv_dir, handles, options):
+        using = options['database']
+        deferred = []
+        if options['defer_indexes']:
+            deferred = [
+                (model, drop_indexes(model, using))
+                for _, model, _, _ in handles
+            ]
+        # Дочерние процессы не должны унаследовать открытые соединения.
+        connections.close_all()
+        try:
+            self.run_stages(csv_dir, handles, options)
+        finally:
+            for model, indexes in deferred:
+                create_indexes(using, indexes)
+
+    def run_stages(self, csv_dir, handles, options):
+        """
+        Запускает файл, как только загружены все файлы, от которых он
+        зависит; файлы из PARTITION_KEYS делятся на --workers частей.
+        """
+        workers = options['workers']
+        stage_options = {
+            key: options[key]
+            for key in ('chunk_size', 'batch_size', 'strict', 'database')
+        }
+        pending = {file: set(depends) for file, _, _, depends in handles}
+        done = {handle[0] for handle in FILE_HANDLE} - set(pending)
+        shards_left, running = {}, {}
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+            while pending or running:
+                for file in [f for f, d in pending.items() if d <= done]:
+                    del pending[file]
+                    shards = workers if file in PARTITION_KEYS else 1
+                    shards_left[file] = shards
                     self.stdout.write(
-                        f'Добавлено объектов: {len(objects_to_create)}; '
-                        f'строк в документе: {counter}')
-                except ValueError:
-                    self.stderr.write('Ошибка заполнения. Импорт отменен.')
+                        f'Импорт из файла {file}, частей: {shards}')
+                    for shard in range(shards):
+                        future = pool.submit(
+                            import_stage, file, str(csv_dir), shard, shards,
+                            stage_options)
+                        running[future] = file
+                if not running:
+                    raise CommandError(
+                        f'Циклическая зависимость файлов: {sorted(pending)}')
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+                    file, shard, total, seconds, errors = future.result()
+                    self.report_file(
+                        f'{file} [{shard + 1}]', total, seconds, errors)
+                    shards_left[file] -= 1
+                    if not shards_left[file]:
+                        done.add(file)
@@ -0,0 +1,15 @@
+"""
+Для запуска программы введите команду python manage.py rebuild_ratings.
+"""
+from django.core.management import BaseCommand
+from django.db import transaction
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds stored rating aggregates of titles from reviews'
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            updated = Title.objects.rebuild_ratings()
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
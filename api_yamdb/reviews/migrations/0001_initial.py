@@ -0,0 +1,97 @@
+# Generated by Django 3.2 on 2026-10-18 19:04
+
+import api.validators
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название')),
+                ('slug', models.SlugField(unique=True, verbose_name='Ссылка')),
+            ],
+            options={
+                'verbose_name': 'категория',
+                'verbose_name_plural': 'категории',
+                'ordering': ('name',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Текст отзыва')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата публикации')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Комментарий',
+                'verbose_name_plural': 'Комментарии',
+                'ordering': ('-pub_date',),
+                'abstract': False,
+                'default_related_name': 'comments',
+            },
+        ),
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название')),
+                ('slug', models.SlugField(unique=True, verbose_name='Ссылка')),
+            ],
+            options={
+                'verbose_name': 'жанр',
+                'verbose_name_plural': 'жанры',
+                'ordering': ('name',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Текст отзыва')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата публикации')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+                ('score', models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1, message='Минимальное значение - 1'), django.core.validators.MaxValueValidator(10, message='Максимальное значение - 10')], verbose_name='Оценка')),
+            ],
+            options={
+                'verbose_name': 'Отзыв',
+                'verbose_name_plural': 'Отзывы',
+                'ordering': ('-pub_date',),
+                'abstract': False,
+                'default_related_name': 'reviews',
+            },
+        ),
+        migrations.CreateModel(
+            name='Title',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.TextField(db_index=True, max_length=256, verbose_name='Название произведения')),
+                ('year', models.PositiveSmallIntegerField(blank=True, db_index=True, validators=[api.validators.validate_year], verbose_name='Год выпуска')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Описание произведения')),
+                ('rating_sum', models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок')),
+                ('rating_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок')),
+                ('rating', models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='titles', to='reviews.category', verbose_name='Название категории')),
+                ('genre', models.ManyToManyField(blank=True, db_index=True, related_name='titles', to='reviews.Genre', verbose_name='Название жанра')),
+            ],
+            options={
+                'verbose_name': 'Произведение',
+                'verbose_name_plural': 'Произведения',
+                'ordering': ('-year',),
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Связь произведений с жанрами становится явной моделью GenreTitle
+    поверх той же таблицы reviews_title_genre. Таблица, её уникальное
+    ограничение и индексы внешних ключей уже есть, поэтому в базе
+    ничего не создаётся: меняется только состояние моделей. Индекс
+    genre_id затем заменяется составным (genre_id, title_id).
+    """
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='GenreTitle',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.genre', verbose_name='Жанр')),
+                        ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.title', verbose_name='Произведение')),
+                    ],
+                    options={
+                        'verbose_name': 'жанр произведения',
+                        'verbose_name_plural': 'жанры произведений',
+                        'db_table': 'reviews_title_genre',
+                        'unique_together': {('title', 'genre')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='title',
+                    name='genre',
+                    field=models.ManyToManyField(blank=True, related_name='titles', through='reviews.GenreTitle', to='reviews.Genre', verbose_name='Название жанра'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2 on 2026-10-18 19:04
+
+import api.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_genretitle'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='name',
+            field=models.CharField(db_index=True, max_length=256, verbose_name='Название'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='review',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='reviews.review', verbose_name='Отзыв'),
+        ),
+        migrations.AlterField(
+            model_name='genre',
+            name='name',
+            field=models.CharField(db_index=True, max_length=256, verbose_name='Название'),
+        ),
+        migrations.AlterField(
+            model_name='genretitle',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='reviews.genre', verbose_name='Жанр'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='title',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='category',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='titles', to='reviews.category', verbose_name='Название категории'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.PositiveSmallIntegerField(blank=True, validators=[api.validators.validate_year], verbose_name='Год выпуска'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date', '-id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='title_genre_genre_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'name'], name='title_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from api.validators import validate_year
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, NullIf
 
 from .base_models import BaseModelGenreCategory, BaseModelReviewComment
 
@@ -22,6 +24,40 @@ class Genre(BaseModelGenreCategory):
         verbose_name_plural = 'жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+    """Запросы для поддержания агрегатов рейтинга произведений."""
+
+    def shift_rating(self, title_id, score_delta, count_delta):
+        """Атомарно сдвигает сумму и количество оценок произведения."""
+        if title_id is None:
+            return 0
+        return self.filter(pk=title_id).update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta,
+            rating=(
+                (F('rating_sum') + score_delta)
+                / NullIf(F('rating_count') + count_delta, 0)
+            ),
+        )
+
+    def rebuild_ratings(self):
+        """Пересчитывает агрегаты рейтинга по таблице отзывов."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')).order_by().values('title')
+        self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0,
+            ),
+        )
+        return self.update(
+            rating=F('rating_sum') / NullIf(F('rating_count'), 0))
+
+
 class Title(models.Model):
     """Модель для произведений."""
     name = models.TextField(
@@ -33,7 +69,6 @@ class Title(models.Model):
         'Год выпуска',
         blank=True,
         validators=[validate_year],
-        db_index=True,
     )
     category = models.ForeignKey(
         Category,
@@ -42,29 +77,78 @@ class Title(models.Model):
         blank=True,
         null=True,
         related_name='titles',
+        db_index=False,
     )
     genre = models.ManyToManyField(
         Genre,
         verbose_name='Название жанра',
         blank=True,
-        db_index=True,
         related_name='titles',
+        through='GenreTitle',
     )
     description = models.TextField(
         'Описание произведения',
         null=True,
         blank=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.PositiveSmallIntegerField(
+        'Рейтинг',
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('-year',)
+        # Списки фильтруются по категории или году и сортируются
+        # по названию; индексы заменяют и одиночные индексы полей.
+        indexes = (
+            models.Index(fields=('category', 'name'),
+                         name='title_category_name_idx'),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+        )
 
     def __str__(self):
         return self.name
 
 
+class GenreTitle(models.Model):
+    """Связь произведения с жанром."""
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, verbose_name='Произведение')
+    genre = models.ForeignKey(
+        Genre, on_delete=models.CASCADE, verbose_name='Жанр',
+        db_index=False)
+
+    class Meta:
+        db_table = 'reviews_title_genre'
+        verbose_name = 'жанр произведения'
+        verbose_name_plural = 'жанры произведений'
+        unique_together = ('title', 'genre')
+        # Фильтр ?genre= идёт от жанра к произведениям.
+        indexes = (
+            models.Index(fields=('genre', 'title'),
+                         name='title_genre_genre_title_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.title_id}: {self.genre_id}'
+
+
 class Review(BaseModelReviewComment):
     """Модель для представления отзыва."""
     score = models.PositiveSmallIntegerField(
@@ -82,6 +166,7 @@ class Review(BaseModelReviewComment):
         on_delete=models.CASCADE,
         verbose_name='Произведение',
         null=True,
+        db_index=False,
     )
 
     class Meta(BaseModelReviewComment.Meta):
@@ -93,10 +178,34 @@ class Review(BaseModelReviewComment):
             'title',
         )
         ordering = ('-pub_date',)
+        # Отзывы произведения выбираются в порядке (-pub_date, -id).
+        indexes = (
+            models.Index(fields=('title', '-pub_date', '-id'),
+                         name='review_title_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        # Точка сохранения не нужна: при ошибке откатывается вся
+        # внешняя транзакция.
+        with transaction.atomic(savepoint=False):
+            previous = None
+            if not self._state.adding:
+                previous = Review.objects.select_for_update().filter(
+                    pk=self.pk).values_list('title_id', 'score').first()
+            super().save(*args, **kwargs)
+            if previous is None:
+                Title.objects.shift_rating(self.title_id, self.score, 1)
+            elif previous[0] == self.title_id:
+                if previous[1] != self.score:
+                    Title.objects.shift_rating(
+                        self.title_id, self.score - previous[1], 0)
+            else:
+                Title.objects.shift_rating(previous[0], -previous[1], -1)
+                Title.objects.shift_rating(self.title_id, self.score, 1)
+
 
 class Comment(BaseModelReviewComment):
     """Модель комментарий."""
@@ -104,7 +213,8 @@ class Comment(BaseModelReviewComment):
         Review,
         on_delete=models.CASCADE,
         null=True,
-        verbose_name='Отзыв'
+        verbose_name='Отзыв',
+        db_index=False,
     )
 
     class Meta(BaseModelReviewComment.Meta):
@@ -112,6 +222,11 @@ class Comment(BaseModelReviewComment):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        # Комментарии отзыва выбираются в порядке (-pub_date, -id).
+        indexes = (
+            models.Index(fields=('review', '-pub_date', '-id'),
+                         name='comment_review_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.text
@@ -0,0 +1,141 @@
+"""
+Полнотекстовый поиск по названию и описанию произведений.
+
+В PostgreSQL используются GIN-индексы по tsvector и pg_trgm, в SQLite
+(DEBUG_SQLITE) — виртуальная таблица FTS5, которую триггеры держат
+в актуальном состоянии при любой записи в таблицу произведений.
+Индексы создаются после migrate, поэтому отдельные миграции не нужны.
+"""
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+
+from .models import Title
+
+TITLE_TABLE = Title._meta.db_table
+FTS_TABLE = f'{TITLE_TABLE}_fts'
+SEARCH_CONFIG = 'russian'
+
+
+class FallbackTitleSearch:
+    """Поиск без индексов для прочих СУБД."""
+
+    def install(self, cursor):
+        pass
+
+    def search(self, queryset, text):
+        return queryset.filter(
+            Q(name__icontains=text) | Q(description__icontains=text)
+        ).extra(select={'search_rank': '0'})
+
+
+class PostgresTitleSearch:
+    """Поиск по tsvector с добором похожих названий через pg_trgm."""
+
+    vector = (
+        f"to_tsvector('{SEARCH_CONFIG}', coalesce({{table}}name, '') "
+        f"|| ' ' || coalesce({{table}}description, ''))"
+    )
+    query = f"plainto_tsquery('{SEARCH_CONFIG}', %s)"
+
+    def install(self, cursor):
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TITLE_TABLE}_search_idx '
+            f'ON {TITLE_TABLE} USING gin ({self.vector.format(table="")})'
+        )
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TITLE_TABLE}_name_trgm_idx '
+            f'ON {TITLE_TABLE} USING gin (name gin_trgm_ops)'
+        )
+
+    def search(self, queryset, text):
+        vector = self.vector.format(table=f'{TITLE_TABLE}.')
+        pattern = '%{}%'.format(re.sub(r'([\\%_])', r'\\\1', text))
+        return queryset.extra(
+            select={
+                'search_rank': (
+                    f'ts_rank({vector}, {self.query}) '
+                    f'+ similarity({TITLE_TABLE}.name, %s)'
+                ),
+            },
+            select_params=(text, text),
+            where=[
+                f'({vector} @@ {self.query} '
+                f'OR {TITLE_TABLE}.name ILIKE %s '
+                f'OR {TITLE_TABLE}.name %% %s)'
+            ],
+            params=(text, pattern, text),
+        )
+
+
+class SQLiteTitleSearch:
+    """Поиск по внешней (content=) таблице FTS5."""
+
+    def install(self, cursor):
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            f"name, description, content='{TITLE_TABLE}', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        insert = (
+            f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+            'VALUES (new.id, new.name, new.description);'
+        )
+        delete = (
+            f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) '
+            "VALUES ('delete', old.id, old.name, old.description);"
+        )
+        triggers = (
+            ('ai', 'AFTER INSERT', insert),
+            ('ad', 'AFTER DELETE', delete),
+            ('au', 'AFTER UPDATE OF name, description', delete + insert),
+        )
+        for suffix, event, body in triggers:
+            cursor.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{suffix} '
+                f'{event} ON {TITLE_TABLE} BEGIN {body} END'
+            )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+    def search(self, queryset, text):
+        words = re.findall(r'\w+', text)
+        if not words:
+            return queryset.none()
+        match = ' '.join(f'"{word}"*' for word in words)
+        return queryset.extra(
+            select={'search_rank': f'-{FTS_TABLE}.rank'},
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = {TITLE_TABLE}.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=(match,),
+        )
+
+
+BACKENDS = {
+    'postgresql': PostgresTitleSearch,
+    'sqlite': SQLiteTitleSearch,
+}
+
+
+def get_backend(using=DEFAULT_DB_ALIAS):
+    return BACKENDS.get(connections[using].vendor, FallbackTitleSearch)()
+
+
+def search_titles(queryset, text):
+    """
+    Отбирает произведения по запросу и добавляет к ним поле search_rank:
+    чем больше значение, тем выше релевантность.
+    """
+    return get_backend(queryset.db).search(queryset, text)
+
+
+def install_search_indexes(using=DEFAULT_DB_ALIAS, **kwargs):
+    """Создаёт поисковые индексы; подключается к сигналу post_migrate."""
+    with connections[using].cursor() as cursor:
+        get_backend(using).install(cursor)
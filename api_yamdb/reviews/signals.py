@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Review, Title
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Вычитает оценку удалённого отзыва, в том числе при каскаде."""
+    Title.objects.shift_rating(instance.title_id, -instance.score, -1)
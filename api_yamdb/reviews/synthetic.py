@@ -0,0 +1,214 @@
+"""
+Детерминированные синтетические данные для нагрузочных замеров.
+
+Распределения неравномерные, как в реальной базе: популярность
+произведений, жанров, категорий и активность пользователей подчиняются
+закону Ципфа, оценки смещены к высоким, годы выпуска — к недавним.
+Пара (автор, произведение) у отзывов уникальна. Строки выдаются
+словарями {поле модели: значение} в порядке столбцов EXPORT_HANDLE,
+поэтому их можно и записать в базу, и выгрузить в csv для import_data.
+"""
+import random
+from bisect import bisect
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+# Объём данных при scale=1; scale=100 — 100 тыс. произведений
+# и 10 млн отзывов.
+UNIT = {
+    'titles': 1000,
+    'users': 5000,
+    'reviews': 100_000,
+    'comments': 20_000,
+}
+CATEGORIES = ('Книги', 'Фильмы', 'Музыка', 'Сериалы', 'Игры', 'Комиксы',
+              'Спектакли', 'Живопись')
+GENRES = ('Драма', 'Комедия', 'Фантастика', 'Фэнтези', 'Детектив',
+          'Триллер', 'Ужасы', 'Мелодрама', 'Приключения', 'Боевик',
+          'Рок', 'Джаз', 'Классика', 'Поп', 'Хип-хоп', 'Электроника',
+          'Документальный', 'Исторический', 'Военный', 'Вестерн',
+          'Мюзикл', 'Аниме', 'Сказка', 'Артхаус', 'Нуар', 'Биография',
+          'Спорт', 'Семейный', 'Криминал', 'Мистика')
+WORDS = ('сюжет', 'герой', 'финал', 'автор', 'атмосфера', 'музыка',
+         'диалоги', 'начало', 'темп', 'идея', 'мир', 'персонажи',
+         'отличный', 'слабый', 'неожиданный', 'затянутый', 'яркий',
+         'глубокий', 'скучный', 'смелый', 'очень', 'совсем', 'местами')
+SCORE_WEIGHTS = (2, 2, 3, 4, 6, 9, 14, 20, 22, 18)
+ZIPF_EXPONENT = 1.1
+MAX_GENRES = 3
+EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+HISTORY = timedelta(days=5 * 365)
+
+
+def sizes(scale):
+    return {
+        name: max(1, round(size * scale)) for name, size in UNIT.items()
+    }
+
+
+def allocate(total, weights, cap):
+    """Делит total пропорционально weights, не больше cap на элемент."""
+    counts = [0] * len(weights)
+    active = list(range(len(weights)))
+    while total > 0 and active:
+        weight_sum = sum(weights[i] for i in active)
+        given, still_active = 0, []
+        for i in active:
+            share = min(cap - counts[i],
+                        int(total * weights[i] / weight_sum))
+            counts[i] += share
+            given += share
+            if counts[i] < cap:
+                still_active.append(i)
+        total -= given
+        active = still_active
+        if not given:
+            break
+    # Остаток от округления достаётся самым популярным.
+    for i in sorted(active, key=lambda i: -weights[i])[:total]:
+        counts[i] += 1
+    return counts
+
+
+class Popularity:
+    """Выбор из ids с весами по закону Ципфа в случайном порядке."""
+
+    def __init__(self, rng, ids):
+        self.rng = rng
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.weights = [
+            1 / rank ** ZIPF_EXPONENT for rank in range(1, len(self.ids) + 1)
+        ]
+        self.cumulative = list(accumulate(self.weights))
+
+    def weight_of(self):
+        return dict(zip(self.ids, self.weights))
+
+    def choice(self):
+        point = self.rng.random() * self.cumulative[-1]
+        return self.ids[min(bisect(self.cumulative, point),
+                            len(self.ids) - 1)]
+
+    def distinct(self, count):
+        """count разных ids; популярные выпадают чаще."""
+        if count * 4 >= len(self.ids):
+            return self.rng.sample(self.ids, count)
+        chosen = {}
+        for _ in range(count * 4):
+            chosen[self.choice()] = None
+            if len(chosen) == count:
+                return list(chosen)
+        rest = [item for item in self.ids if item not in chosen]
+        return [*chosen, *self.rng.sample(rest, count - len(chosen))]
+
+
+class SyntheticData:
+    """Генератор таблиц; таблицы нужно читать в порядке tables()."""
+
+    def __init__(self, scale, seed=0):
+        self.rng = random.Random(seed)
+        self.sizes = sizes(scale)
+        users = range(1, self.sizes['users'] + 1)
+        titles = range(1, self.sizes['titles'] + 1)
+        self.user_activity = Popularity(self.rng, users)
+        self.title_popularity = Popularity(self.rng, titles)
+        self.categories = Popularity(
+            self.rng, range(1, len(CATEGORIES) + 1))
+        self.genres = Popularity(self.rng, range(1, len(GENRES) + 1))
+        weights = self.title_popularity.weight_of()
+        self.review_counts = allocate(
+            self.sizes['reviews'], [weights[title] for title in titles],
+            self.sizes['users'])
+        # Отзывы получают id подряд по произведениям.
+        self.first_review = [1]
+        for count in self.review_counts:
+            self.first_review.append(self.first_review[-1] + count)
+
+    def tables(self):
+        return (
+            ('category', self.category_rows()),
+            ('genre', self.genre_rows()),
+            ('users', self.user_rows()),
+            ('titles', self.title_rows()),
+            ('genre_title', self.genre_title_rows()),
+            ('review', self.review_rows()),
+            ('comments', self.comment_rows()),
+        )
+
+    def text(self, low, high):
+        words = self.rng.choices(WORDS, k=self.rng.randint(low, high))
+        return ' '.join(words).capitalize() + '.'
+
+    def moment(self):
+        return EPOCH - HISTORY * self.rng.random() ** 2
+
+    def category_rows(self):
+        for pk, name in enumerate(CATEGORIES, 1):
+            yield {'id': pk, 'name': name, 'slug': f'category-{pk}'}
+
+    def genre_rows(self):
+        for pk, name in enumerate(GENRES, 1):
+            yield {'id': pk, 'name': name, 'slug': f'genre-{pk}'}
+
+    def user_rows(self):
+        for pk in range(1, self.sizes['users'] + 1):
+            roll = self.rng.random()
+            role = 'admin' if roll < 0.001 else (
+                'moderator' if roll < 0.01 else 'user')
+            yield {
+                'id': pk, 'username': f'user{pk}',
+                'email': f'user{pk}@yamdb.fake', 'role': role,
+                'bio': '', 'first_name': '', 'last_name': '',
+                'password': '', 'is_staff': False, 'is_superuser': False,
+                'is_active': True, 'date_joined': EPOCH - HISTORY,
+                'last_login': None,
+            }
+
+    def title_rows(self):
+        for pk in range(1, self.sizes['titles'] + 1):
+            age = min(int(self.rng.expovariate(1 / 15)), 120)
+            yield {
+                'id': pk, 'name': f'{self.text(1, 4)[:-1]} {pk}',
+                'year': EPOCH.year - age,
+                'category_id': self.categories.choice(),
+                'description': None,
+            }
+
+    def genre_title_rows(self):
+        pk = 0
+        for title in range(1, self.sizes['titles'] + 1):
+            count = self.rng.randint(1, MAX_GENRES)
+            for genre in self.genres.distinct(count):
+                pk += 1
+                yield {'id': pk, 'title_id': title, 'genre_id': genre}
+
+    def review_rows(self):
+        scores = range(1, len(SCORE_WEIGHTS) + 1)
+        for title, count in enumerate(self.review_counts, 1):
+            authors = self.user_activity.distinct(count)
+            first = self.first_review[title - 1]
+            for pk, author in enumerate(authors, first):
+                yield {
+                    'id': pk, 'title_id': title, 'text': self.text(3, 30),
+                    'author_id': author,
+                    'score': self.rng.choices(scores, SCORE_WEIGHTS)[0],
+                    'pub_date': self.moment(),
+                }
+
+    def comment_rows(self):
+        if not any(self.review_counts):
+            return
+        for pk in range(1, self.sizes['comments'] + 1):
+            title = self.title_popularity.choice()
+            while not self.review_counts[title - 1]:
+                title = self.title_popularity.choice()
+            first = self.first_review[title - 1]
+            yield {
+                'id': pk,
+                'review_id': self.rng.randrange(
+                    first, self.first_review[title]),
+                'text': self.text(2, 15),
+                'author_id': self.user_activity.choice(),
+                'pub_date': self.moment(),
+            }
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -17,4 +17,18 @@ class UserAdmin(admin.ModelAdmin):
     search_fields = ('username',)
 
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'created_at',
+        'send_after',
+        'sent_at',
+        'attempts'
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
+
+
 admin.site.register(User, UserAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
@@ -0,0 +1,65 @@
+"""
+Для запуска обработчика очереди писем введите команду
+python manage.py send_emails.
+
+Обработчик держит одно соединение с почтовым сервером и отправляет письма
+пачками; неудачные попытки повторяются с экспоненциальной задержкой.
+"""
+import time
+
+from django.core.mail import get_connection
+from django.core.management import BaseCommand
+from users.outbox import DEFAULT_LEASE, send_batch
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails from the outbox table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Emails claimed and sent per batch')
+        parser.add_argument(
+            '--max-attempts', type=int, default=5,
+            help='Give up on an email after N failed attempts')
+        parser.add_argument(
+            '--backoff', type=float, default=30,
+            help='Delay in seconds before the first retry, doubled each time')
+        parser.add_argument(
+            '--max-backoff', type=float, default=3600,
+            help='Upper bound for the retry delay in seconds')
+        parser.add_argument(
+            '--lease', type=float, default=DEFAULT_LEASE,
+            help='Seconds a claimed email is hidden from other workers')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to sleep when the outbox is empty')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit when no emails are due instead of polling')
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        total_sent = total_failed = 0
+        try:
+            while True:
+                sent, failed = send_batch(
+                    connection, options['batch_size'],
+                    options['max_attempts'], options['backoff'],
+                    options['max_backoff'], options['lease'],
+                )
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(
+                        f'Отправлено писем: {sent}, ошибок: {failed}')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+        self.stdout.write(
+            f'Всего отправлено писем: {total_sent}, ошибок: {total_failed}')
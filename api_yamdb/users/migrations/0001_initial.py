@@ -0,0 +1,71 @@
+# Generated by Django 3.2 on 2026-10-18 19:04
+
+import django.contrib.auth.models
+from django.db import migrations, models
+import django.utils.timezone
+import users.validators
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='Тема')),
+                ('message', models.TextField(verbose_name='Текст письма')),
+                ('from_email', models.EmailField(max_length=254, verbose_name='Отправитель')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('send_after', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Отправить не раньше')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ('send_after', 'id'),
+            },
+        ),
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('username', models.CharField(help_text='Введите имя пользователя', max_length=150, unique=True, validators=[users.validators.validate_username], verbose_name='Имя пользователя')),
+                ('first_name', models.CharField(blank=True, help_text='Введите имя', max_length=150, verbose_name='Имя')),
+                ('last_name', models.CharField(blank=True, help_text='Введите фамилию', max_length=150, verbose_name='Фамилия')),
+                ('bio', models.TextField(blank=True, help_text='Введите описание пользователя', null=True, verbose_name='Описание пользователя')),
+                ('email', models.EmailField(help_text='Введите адрес электронной почты', max_length=254, unique=True, verbose_name='Адрес электронной почты')),
+                ('role', models.CharField(choices=[('user', 'пользователь'), ('moderator', 'модератор'), ('admin', 'администратор')], default='user', help_text='Выбирите права пользователя', max_length=13, verbose_name='Права пользователя')),
+                ('confirmation_code', models.CharField(blank=True, help_text='Введите код подтверждения', max_length=50, verbose_name='Код подтверждения')),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.Group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.Permission', verbose_name='user permissions')),
+            ],
+            options={
+                'verbose_name': 'Пользователь',
+                'verbose_name_plural': 'Пользователи',
+                'ordering': ('username',),
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(fields=('username', 'email'), name='unique_username_email'),
+        ),
+    ]
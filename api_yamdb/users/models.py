@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.db.models import CharField, EmailField, TextField
+from django.utils import timezone
 
 from .validators import validate_username
 
@@ -83,3 +84,43 @@ class User(AbstractUser):
 
     def __str__(self):
         return f'{self.username}, {self.email}'
+
+
+class OutgoingEmailQuerySet(models.QuerySet):
+
+    def due(self, max_attempts, now=None):
+        """Неотправленные письма, время повторной попытки которых пришло."""
+        return self.filter(
+            sent_at__isnull=True,
+            attempts__lt=max_attempts,
+            send_after__lte=now or timezone.now(),
+        )
+
+
+class OutgoingEmail(models.Model):
+    """
+    Письмо в очереди на отправку.
+
+    Записывается в той же транзакции, что и изменение, которое его
+    вызвало; отправляет письма команда send_emails.
+    """
+    subject = CharField('Тема', max_length=255)
+    message = TextField('Текст письма')
+    from_email = EmailField('Отправитель')
+    recipient = EmailField('Получатель')
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    send_after = models.DateTimeField(
+        'Отправить не раньше', default=timezone.now, db_index=True)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField('Попыток отправки', default=0)
+    last_error = TextField('Последняя ошибка', blank=True)
+
+    objects = OutgoingEmailQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('send_after', 'id')
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
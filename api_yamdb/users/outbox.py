@@ -0,0 +1,100 @@
+"""
+Очередь исходящих писем.
+
+Запрос только сохраняет письмо в таблицу OutgoingEmail, поэтому медленный
+почтовый сервер не задерживает ответ API. Команда send_emails забирает
+письма пачками и отправляет их через одно соединение с почтовым сервером;
+после отправки текст письма стирается.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+# Сколько секунд забранное письмо не достаётся другим обработчикам.
+DEFAULT_LEASE = 300
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    """Ставит письмо в очередь; аргументы как у send_mail."""
+    return OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(
+            subject=subject,
+            message=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipient=recipient,
+        )
+        for recipient in recipient_list
+    )
+
+
+def retry_delay(attempts, backoff, max_backoff):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(
+        seconds=min(backoff * 2 ** (attempts - 1), max_backoff))
+
+
+def claim_batch(batch_size, max_attempts, lease):
+    """
+    Забирает пачку писем к отправке и сразу фиксирует транзакцию.
+
+    Строки выбираются с блокировкой (SKIP LOCKED там, где СУБД это
+    умеет); попытка засчитывается, а send_after сдвигается на lease
+    секунд, поэтому другие обработчики эти письма не возьмут. Если
+    обработчик упадёт во время отправки, письма вернутся в очередь
+    по истечении lease.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .due(max_attempts)[:batch_size]
+        )
+        leased_until = timezone.now() + timedelta(seconds=lease)
+        for email in batch:
+            email.attempts += 1
+            email.send_after = leased_until
+        OutgoingEmail.objects.bulk_update(batch, ('attempts', 'send_after'))
+    return batch
+
+
+def send_batch(connection, batch_size, max_attempts, backoff, max_backoff,
+               lease=DEFAULT_LEASE):
+    """
+    Отправляет одну пачку писем и возвращает (отправлено, ошибок).
+
+    Почтовый сервер вызывается вне транзакции: строки уже забраны
+    claim_batch. Результат записывается сразу после каждого письма.
+    Текст отправленного письма (в нём код подтверждения) стирается.
+    """
+    sent = failed = 0
+    for email in claim_batch(batch_size, max_attempts, lease):
+        try:
+            # Открывает соединение, только если оно ещё не открыто
+            # или было закрыто после ошибки.
+            connection.open()
+            if not connection.send_messages([EmailMessage(
+                email.subject, email.message, email.from_email,
+                [email.recipient],
+            )]):
+                raise RuntimeError('Почтовый сервер не принял письмо')
+        except Exception as error:
+            connection.close()
+            email.last_error = f'{type(error).__name__}: {error}'
+            email.send_after = timezone.now() + retry_delay(
+                email.attempts, backoff, max_backoff)
+            if email.attempts >= max_attempts:
+                # Попыток больше не будет: код хранить незачем.
+                email.message = ''
+            failed += 1
+        else:
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.message = ''
+            sent += 1
+        email.save(update_fields=(
+            'message', 'sent_at', 'send_after', 'last_error'))
+    return sent, failed
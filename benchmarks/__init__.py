@@ -0,0 +1,6 @@
+"""
+Замеры производительности API.
+
+Запуск из корня репозитория, например:
+python -m benchmarks.serializers --rows 2000
+"""
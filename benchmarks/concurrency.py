@@ -0,0 +1,219 @@
+"""
+Конкурентные замеры: синхронные воркеры gunicorn (WSGI) против воркеров
+uvicorn с асинхронным путём чтения (ASGI, api/asyncread.py).
+
+Много клиентов одновременно отправляют GET-запросы к каталогу
+и отзывам; каждый клиент медленный — передаёт запрос частями
+с паузой --client-delay, а каждый запрос к базе задерживается на
+--db-latency. Для каждого режима выводятся пропускная способность
+и задержки (p50, p95).
+
+python -m benchmarks.concurrency --scale 0.001 --workers 2 --concurrency 32
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from . import dataset, environment
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SERVERS = {
+    'wsgi': ('benchmarks.servers:wsgi', ()),
+    'asgi': ('benchmarks.servers:asgi',
+             ('--worker-class', 'uvicorn.workers.UvicornWorker')),
+}
+
+
+def read_urls():
+    """GET-маршруты каталога и отзывов на самых популярных объектах."""
+    from reviews.models import Category, Genre
+
+    from .endpoints import hot_objects
+
+    review, comment = hot_objects()
+    title = review.title_id
+    return [
+        '/api/v1/titles/',
+        f'/api/v1/titles/{title}/',
+        f'/api/v1/titles/?genre={Genre.objects.first().slug}',
+        f'/api/v1/titles/?category={Category.objects.first().slug}',
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+        f'/api/v1/titles/{title}/reviews/',
+        f'/api/v1/titles/{title}/reviews/{review.id}/',
+        f'/api/v1/titles/{title}/reviews/{review.id}/comments/',
+        f'/api/v1/titles/{title}/reviews/{review.id}/comments/{comment.id}/',
+    ]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, db_path, port, workers, db_latency):
+    app, extra = SERVERS[mode]
+    env = {
+        **os.environ,
+        'BENCHMARK_DB': str(db_path),
+        'BENCHMARK_DB_LATENCY': str(db_latency),
+        'API_ASYNC_READS': str(mode == 'asgi'),
+        'REQUEST_TIMING_SLOW_MS': str(10 ** 6),
+    }
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', app, *extra,
+         '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+         '--log-level', 'warning'],
+        cwd=ROOT_DIR, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f'Сервер {mode} не запустился')
+
+
+def slow_request(port, url, delay):
+    """Отправляет запрос в два приёма с паузой и читает ответ целиком."""
+    raw = (
+        f'GET {url} HTTP/1.1\r\nHost: localhost\r\n'
+        'Accept: application/json\r\nConnection: close\r\n\r\n'
+    ).encode('ascii')
+    middle = len(raw) // 2
+    with socket.create_connection(('127.0.0.1', port), timeout=60) as sock:
+        sock.sendall(raw[:middle])
+        time.sleep(delay)
+        sock.sendall(raw[middle:])
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    status_line = b''.join(chunks).split(b'\r\n', 1)[0]
+    return int(status_line.split()[1])
+
+
+def load_test(port, urls, concurrency, requests, delay):
+    """Запускает concurrency клиентов, всего requests запросов."""
+    latencies, errors = [], []
+    numbers = iter(range(requests))
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                number = next(numbers, None)
+            if number is None:
+                return
+            started = time.perf_counter()
+            try:
+                status = slow_request(port, urls[number % len(urls)], delay)
+            except OSError as error:
+                status = str(error)
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status == 200:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(status)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def summarize(latencies, errors, wall):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'rps': 0, 'p50_ms': None, 'p95_ms': None,
+                'errors': len(errors)}
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return {
+        'rps': round(len(latencies) / wall, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 1),
+        'p95_ms': round(p95 * 1000, 1),
+        'errors': len(errors),
+    }
+
+
+def run(args, db_path):
+    urls = read_urls()
+    results = {}
+    for mode in args.modes:
+        port = free_port()
+        server = start_server(
+            mode, db_path, port, args.workers, args.db_latency)
+        try:
+            # Прогрев: воркеры загружают приложение и соединяются с базой.
+            load_test(port, urls, args.workers, len(urls), 0)
+            results[mode] = load_test(
+                port, urls, args.concurrency, args.requests,
+                args.client_delay)
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+def report(results):
+    print(f'{"режим":8}{"запр/с":>10}{"p50, мс":>10}{"p95, мс":>10}'
+          f'{"ошибки":>9}')
+    for mode, row in results.items():
+        print(f'{mode:8}{row["rps"]:>10}{str(row["p50_ms"]):>10}'
+              f'{str(row["p95_ms"]):>10}{row["errors"]:>9}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=0.001,
+                        help='Share of 100k titles / 10M reviews to load')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--modes', nargs='+', choices=SERVERS,
+                        default=list(SERVERS))
+    parser.add_argument('--workers', type=int, default=2,
+                        help='Server worker processes')
+    parser.add_argument('--concurrency', type=int, default=32,
+                        help='Simultaneous slow clients')
+    parser.add_argument('--requests', type=int, default=400,
+                        help='Total measured requests per mode')
+    parser.add_argument('--client-delay', type=float, default=0.05,
+                        help='Pause in seconds inside each request upload')
+    parser.add_argument('--db-latency', type=float, default=0.002,
+                        help='Added latency in seconds per SQL query')
+    parser.add_argument('--output', type=Path,
+                        help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory, 'benchmark.sqlite3')
+        environment.setup(db_path)
+        dataset.load(args.scale, args.seed)
+        results = run(args, db_path)
+    report(results)
+    if args.output:
+        args.output.write_text(
+            json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+Синтетические данные для замеров.
+
+Данные строит команда generate_data: масштаб 1.0 здесь соответствует
+100 тыс. произведений и 10 млн отзывов (generate_data --scale 100);
+для CI и локальных запусков используется доля от него (--scale 0.001).
+"""
+from io import StringIO
+
+# Во сколько раз единица масштаба замеров больше единицы generate_data.
+GENERATE_SCALE = 100
+
+
+def load(scale, seed=0, chunk_size=5000):
+    """Заполняет пустую базу и возвращает число созданных объектов."""
+    from django.core.management import call_command
+    from reviews.models import Comment, Review, Title
+    from users.models import User
+
+    call_command(
+        'generate_data', scale=scale * GENERATE_SCALE, seed=seed,
+        chunk_size=chunk_size, stdout=StringIO())
+    return {
+        'titles': Title.objects.count(),
+        'users': User.objects.count(),
+        'reviews': Review.objects.count(),
+        'comments': Comment.objects.count(),
+    }
@@ -0,0 +1,257 @@
+"""
+Замеры маршрутов api/urls.py на синтетических данных.
+
+Для каждого маршрута: задержка (p50, p95, среднее), пропускная
+способность одного клиента и число запросов к БД (первый, «холодный»
+запрос и среднее на последующих). Результаты пишутся в JSON и
+сравниваются с сохранённым базовым замером; при регрессии команда
+завершается с кодом 1.
+
+python -m benchmarks.endpoints --scale 0.001
+python -m benchmarks.endpoints --scale 0.001 --save-baseline
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from itertools import count
+from pathlib import Path
+
+from . import dataset, environment
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARKS_DIR / 'baseline.json'
+DEFAULT_OUTPUT = BENCHMARKS_DIR / 'results.json'
+QUERY_KEYS = ('queries_cold', 'queries')
+
+
+class Route:
+    """Запрос к маршруту; data — функция номера запроса для POST."""
+
+    def __init__(self, name, url, method='get', data=None, client='admin'):
+        self.name = name
+        self.url = url
+        self.method = method
+        self.data = data
+        self.client = client
+
+    def send(self, clients, number):
+        client = clients[self.client]
+        if self.method == 'get':
+            response = client.get(self.url)
+        else:
+            response = client.post(self.url, self.data(number))
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+
+def hot_objects():
+    """Отзыв с наибольшим числом комментариев и его произведение."""
+    from django.db.models import Count
+    from reviews.models import Review
+
+    review = Review.objects.annotate(
+        total=Count('comments')).order_by('-total', 'id').first()
+    comment = review.comments.order_by('id').first()
+    return review, comment
+
+
+def router_routes(review, comment):
+    from api.urls import router_v1
+    from django.urls import reverse
+
+    parents = {'title_id': review.title_id, 'review_id': review.id}
+    lookups = {
+        'title': review.title_id, 'reviews': review.id,
+        'comments': comment.id, 'users': review.author.username,
+    }
+    for prefix, viewset, basename in router_v1.registry:
+        kwargs = {name: value for name, value in parents.items()
+                  if f'<{name}>' in prefix}
+        yield Route(f'{basename}-list',
+                    reverse(f'api:{basename}-list', kwargs=kwargs))
+        if basename in lookups and hasattr(viewset, 'retrieve'):
+            lookup = viewset.lookup_url_kwarg or viewset.lookup_field
+            yield Route(f'{basename}-detail', reverse(
+                f'api:{basename}-detail',
+                kwargs={**kwargs, lookup: lookups[basename]}))
+        for action in viewset.get_extra_actions():
+            if 'get' in action.mapping:
+                name = f'{basename}-{action.url_name}'
+                yield Route(name, reverse(f'api:{name}', kwargs=kwargs))
+
+
+def other_routes(user):
+    from django.contrib.auth.tokens import default_token_generator
+    from django.urls import reverse
+
+    code = default_token_generator.make_token(user)
+    yield Route(
+        'user_signup', reverse('api:user_signup'), 'post',
+        lambda number: {
+            'username': f'bench{number}', 'email': f'bench{number}@yamdb.fake'
+        },
+        client='anonymous',
+    )
+    yield Route(
+        'user_signin', reverse('api:user_signin'), 'post',
+        lambda number: {
+            'username': user.username, 'confirmation_code': code
+        },
+        client='anonymous',
+    )
+    yield Route('export', reverse(
+        'api:export', kwargs={'name': 'titles', 'fmt': 'csv'}))
+
+
+def measure(route, clients, requests, numbers):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        response = route.send(clients, next(numbers))
+    cold = len(queries)
+    latencies, total_queries = [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as queries:
+            moment = time.perf_counter()
+            route.send(clients, next(numbers))
+            latencies.append(time.perf_counter() - moment)
+        total_queries += len(queries)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'url': route.url,
+        'method': route.method.upper(),
+        'status': response.status_code,
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p95_ms': round(
+            latencies[int(0.95 * (len(latencies) - 1))] * 1000, 3),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+        'throughput_rps': round(requests / elapsed, 1),
+        'queries_cold': cold,
+        'queries': round(total_queries / requests, 2),
+    }
+
+
+def make_clients():
+    from api.authentication import get_access_token
+    from rest_framework.test import APIClient
+    from users.models import User
+
+    admin = User.objects.create_user(
+        username='bench_admin', email='bench_admin@yamdb.fake',
+        role=User.ADMIN)
+    clients = {'anonymous': APIClient(), 'admin': APIClient()}
+    clients['admin'].credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(admin)}')
+    return clients
+
+
+def run(scale, seed, requests):
+    counts = dataset.load(scale, seed)
+    review, comment = hot_objects()
+    clients = make_clients()
+    routes = [
+        *router_routes(review, comment),
+        *other_routes(review.author),
+    ]
+    numbers = count()
+    return {
+        'meta': {
+            'scale': scale,
+            'seed': seed,
+            'requests': requests,
+            'rows': counts,
+            'created': datetime.now(timezone.utc).isoformat(),
+        },
+        'routes': {
+            route.name: measure(route, clients, requests, numbers)
+            for route in routes
+        },
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Список регрессий относительно базового замера."""
+    if results['meta']['scale'] != baseline['meta']['scale']:
+        return [
+            f'Масштаб замера {results["meta"]["scale"]} не совпадает '
+            f'с базовым {baseline["meta"]["scale"]}'
+        ]
+    problems = []
+    for name, base in baseline['routes'].items():
+        current = results['routes'].get(name)
+        if current is None:
+            problems.append(f'{name}: маршрут не замерен')
+            continue
+        if current['status'] != base['status']:
+            problems.append(
+                f'{name}: статус {current["status"]}, было {base["status"]}')
+        for key in QUERY_KEYS:
+            if current[key] > base[key]:
+                problems.append(
+                    f'{name}: {key} {current[key]}, было {base[key]}')
+        limit = base['p50_ms'] * (1 + tolerance)
+        if current['p50_ms'] > limit:
+            problems.append(
+                f'{name}: p50 {current["p50_ms"]} мс, было {base["p50_ms"]} '
+                f'мс (допустимо до {limit:.3f} мс)')
+    return problems
+
+
+def report(results):
+    print(f'{"маршрут":<24}{"код":>5}{"p50, мс":>10}{"p95, мс":>10}'
+          f'{"запр/с":>9}{"SQL":>6}{"SQL хол.":>10}')
+    for name, row in results['routes'].items():
+        print(f'{name:<24}{row["status"]:>5}{row["p50_ms"]:>10.2f}'
+              f'{row["p95_ms"]:>10.2f}{row["throughput_rps"]:>9.0f}'
+              f'{row["queries"]:>6g}{row["queries_cold"]:>10}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=0.001,
+                        help='Share of 100k titles / 10M reviews to load')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=20,
+                        help='Measured requests per route after warm-up')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=1.0,
+                        help='Allowed p50 slowdown relative to baseline')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the new baseline')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        environment.setup(Path(directory, 'benchmark.sqlite3'))
+        results = run(args.scale, args.seed, args.requests)
+    report(results)
+    target = args.baseline if args.save_baseline else args.output
+    target.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f'Результаты записаны в {target}')
+    if args.save_baseline:
+        return
+    if not args.baseline.exists():
+        print(f'Базовый замер {args.baseline} не найден, сравнение пропущено')
+        return
+    problems = compare(
+        results, json.loads(args.baseline.read_text()), args.tolerance)
+    if problems:
+        print('\nРЕГРЕССИЯ ПРОИЗВОДИТЕЛЬНОСТИ:', file=sys.stderr)
+        for problem in problems:
+            print(f'  {problem}', file=sys.stderr)
+        sys.exit(1)
+    print('Регрессий относительно базового замера нет')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Размер ответов списков с gzip и без, время рендеринга JSON стандартным
+рендерером DRF и FastJSONRenderer (orjson).
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from . import environment
+from .serializers import populate
+
+
+def measure(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def endpoints(title, review, limit):
+    base = f'/api/v1/titles/{title.id}/reviews/'
+    return (
+        ('titles', f'/api/v1/titles/?limit={limit}'),
+        ('reviews', f'{base}?limit={limit}'),
+        ('comments', f'{base}{review.id}/comments/?limit={limit}'),
+        ('genres', f'/api/v1/genres/?limit={limit}'),
+    )
+
+
+def run(rows, limit, repeat):
+    from api.renderers import FastJSONRenderer, orjson
+    from django.test import Client
+    from rest_framework.renderers import JSONRenderer
+
+    if orjson is None:
+        raise SystemExit('orjson не установлен: сравнивать не с чем')
+    title, review = populate(rows)
+    client = Client()
+    results = []
+    for name, url in endpoints(title, review, limit):
+        plain = client.get(url)
+        packed = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        data = plain.data
+        drf = measure(lambda: JSONRenderer().render(data), repeat)
+        fast = measure(lambda: FastJSONRenderer().render(data), repeat)
+        results.append((
+            name, len(plain.content), len(packed.content),
+            packed.get('Content-Encoding', '-'), drf, fast,
+        ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--limit', type=int, default=100,
+                        help='Page size requested from each endpoint')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        environment.setup(Path(directory, 'benchmark.sqlite3'))
+        results = run(args.rows, args.limit, args.repeat)
+    print(f'{"список":<10}{"байт":>9}{"gzip, байт":>12}{"сжатие":>8}'
+          f'{"DRF, мс":>10}{"orjson, мс":>12}{"ускорение":>11}')
+    for name, size, packed, encoding, drf, fast in results:
+        ratio = f'{size / packed:.1f}x' if encoding == 'gzip' else '-'
+        print(f'{name:<10}{size:>9}{packed:>12}{ratio:>8}'
+              f'{drf * 1000:>10.3f}{fast * 1000:>12.3f}{drf / fast:>10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
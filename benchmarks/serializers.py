@@ -0,0 +1,119 @@
+"""
+Сравнение сериализаторов DRF и быстрого пути api/fastread.py.
+
+Для каждого списка печатает строк в секунду обоими способами
+и проверяет, что JSON совпадает байт в байт.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from . import environment
+
+
+def populate(rows):
+    """Один заголовок с rows отзывами, отзыв с rows комментариями."""
+    from reviews.models import Category, Comment, Genre, Review, Title
+    from users.models import User
+
+    # SQLite не возвращает ключи из bulk_create, поэтому объекты
+    # перечитываются после вставки.
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(5))
+    User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(rows)
+    )
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000, category=category,
+              description='Описание')
+        for i in range(rows)
+    )
+    genres = list(Genre.objects.all()[:3])
+    titles = list(Title.objects.order_by('id'))
+    users = list(User.objects.all())
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.id, genre_id=genre.id)
+        for title in titles for genre in genres
+    )
+    Review.objects.bulk_create(
+        Review(title=titles[0], author=user, text='Текст отзыва', score=7)
+        for user in users
+    )
+    review = Review.objects.order_by('id').first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Текст комментария')
+        for user in users
+    )
+    return titles[0], review
+
+
+def measure(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def cases(title, review):
+    from api.fastread import CommentRows, ReviewRows, TitleRows
+    from api.serializers import (CommentSerializer, ReviewSerializer,
+                                 TitleReadSerializer)
+    from reviews.models import Title
+
+    return (
+        ('titles', Title.objects.select_related(
+            'category').prefetch_related('genre').order_by('id'),
+         TitleReadSerializer, TitleRows),
+        ('reviews', title.reviews.select_related('author').order_by('id'),
+         ReviewSerializer, ReviewRows),
+        ('comments', review.comments.select_related('author').order_by('id'),
+         CommentSerializer, CommentRows),
+    )
+
+
+def run(rows, repeat):
+    from rest_framework.renderers import JSONRenderer
+
+    renderer = JSONRenderer()
+    title, review = populate(rows)
+    results = []
+    for name, queryset, serializer_class, rows_class in cases(title, review):
+        def slow():
+            return renderer.render(
+                serializer_class(queryset.all(), many=True).data)
+
+        def fast():
+            renderer_rows = rows_class()
+            return renderer.render(
+                renderer_rows.render(renderer_rows.values(queryset.all())))
+
+        slow_time, slow_json = measure(slow, repeat)
+        fast_time, fast_json = measure(fast, repeat)
+        if slow_json != fast_json:
+            raise SystemExit(f'{name}: JSON быстрого пути отличается')
+        results.append((name, rows / slow_time, rows / fast_time))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        environment.setup(Path(directory, 'benchmark.sqlite3'))
+        results = run(args.rows, args.repeat)
+    print(f'{"список":<10}{"DRF, строк/с":>16}{"values(), строк/с":>20}'
+          f'{"ускорение":>12}')
+    for name, slow, fast in results:
+        print(f'{name:<10}{slow:>16.0f}{fast:>20.0f}{fast / slow:>11.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Приложения для benchmarks.concurrency: wsgi для синхронных воркеров
+gunicorn и asgi для воркеров uvicorn. База и задержка каждого запроса
+к ней (имитация сетевой СУБД) задаются переменными окружения
+BENCHMARK_DB и BENCHMARK_DB_LATENCY (секунды).
+"""
+import os
+import time
+
+from . import environment
+
+environment.setup(os.environ['BENCHMARK_DB'], migrate=False)
+
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+DB_LATENCY = float(os.environ.get('BENCHMARK_DB_LATENCY', 0))
+
+
+def slow_query(execute, sql, params, many, context):
+    time.sleep(DB_LATENCY)
+    return execute(sql, params, many, context)
+
+
+def add_latency(connection, **kwargs):
+    if slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query)
+
+
+if DB_LATENCY:
+    connection_created.connect(add_latency)
+
+wsgi = get_wsgi_application()
+asgi = get_asgi_application()
@@ -1,9 +1,49 @@
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
+    'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_data',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(tmp_path_factory):
+    """
+    Тесты с базой всегда идут на SQLite-файле, а не в памяти, чтобы базу
+    видели дочерние процессы (например, import_data --workers). Если
+    проект настроен на postgres (DEBUG_SQLITE не задан, как в CI),
+    SQLite получают только подключения: settings.DATABASES не меняется,
+    его проверяет test_settings.
+    """
+    from django.db import connections
+
+    sqlite = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': '',
+        'TEST': {
+            'NAME': str(tmp_path_factory.mktemp('db') / 'test.sqlite3'),
+        },
+    }
+    default = connections.settings['default']
+    if default['ENGINE'] == sqlite['ENGINE']:
+        default.setdefault('TEST', {})['NAME'] = sqlite['TEST']['NAME']
+        return
+    connections.close_all()
+    connections.settings = {**connections.settings, 'default': sqlite}
+    connections.ensure_defaults('default')
+    connections.prepare_test_settings('default')
+    if hasattr(connections._connections, 'default'):
+        del connections['default']
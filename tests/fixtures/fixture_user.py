@@ -0,0 +1,62 @@
+import pytest
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin', email='testadmin@yamdb.fake', role='admin',
+        password='1234567'
+    )
+
+
+@pytest.fixture
+def moderator(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestModerator', email='testmoder@yamdb.fake',
+        role='moderator', password='1234567'
+    )
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser', email='testuser@yamdb.fake', role='user',
+        password='1234567'
+    )
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUserAnother', email='testuseranother@yamdb.fake',
+        role='user', password='1234567'
+    )
+
+
+def _client_for(user):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    return client
+
+
+@pytest.fixture
+def admin_client(admin):
+    return _client_for(admin)
+
+
+@pytest.fixture
+def moderator_client(moderator):
+    return _client_for(moderator)
+
+
+@pytest.fixture
+def user_client(user):
+    return _client_for(user)
+
+
+@pytest.fixture
+def another_user_client(another_user):
+    return _client_for(another_user)
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, override_settings
+
+
+def build_view(viewset, actions):
+    with override_settings(API_ASYNC_READS=True):
+        return viewset.as_view(actions)
+
+
+class TestAsyncReadView:
+
+    def test_async_only_in_asgi_mode(self):
+        from api.views import TitlesViewSet
+
+        actions = {'get': 'list', 'post': 'create'}
+        view = build_view(TitlesViewSet, actions)
+        assert asyncio.iscoroutinefunction(view), (
+            'Проверьте, что с API_ASYNC_READS представление асинхронное'
+        )
+        assert view.cls is TitlesViewSet and view.actions == actions
+        assert view.csrf_exempt
+        assert not asyncio.iscoroutinefunction(TitlesViewSet.as_view(actions))
+
+    def test_reads_in_pool_writes_in_sync_thread(self, monkeypatch):
+        from api.views import CategoryViewSet
+        from rest_framework.response import Response
+
+        threads = {}
+
+        def handler(name):
+            def action(self, request, *args, **kwargs):
+                threads.setdefault(name, set()).add(threading.get_ident())
+                time.sleep(0.2)
+                return Response({})
+            return action
+
+        monkeypatch.setattr(CategoryViewSet, 'list', handler('read'))
+        monkeypatch.setattr(CategoryViewSet, 'create', handler('write'))
+        monkeypatch.setattr(CategoryViewSet, 'permission_classes', ())
+        view = build_view(CategoryViewSet, {'get': 'list', 'post': 'create'})
+        factory = RequestFactory()
+
+        async def run(*requests):
+            return await asyncio.gather(*(view(request) for request in requests))
+
+        started = time.perf_counter()
+        responses = async_to_sync(run)(factory.get('/'), factory.get('/'))
+        elapsed = time.perf_counter() - started
+        assert [response.status_code for response in responses] == [200, 200]
+        assert elapsed < 0.35, (
+            'Проверьте, что чтения выполняются параллельно в пуле потоков'
+        )
+        assert threading.get_ident() not in threads['read']
+
+        async_to_sync(run)(factory.post('/'))
+        assert threads['write'] == {threading.get_ident()}, (
+            'Проверьте, что запись выполняется в общем синхронном потоке'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadResponses:
+
+    def test_same_output_as_sync(self, user_client, review):
+        from api.views import ReviewViewSet
+
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        expected = user_client.get(url)
+        view = build_view(ReviewViewSet, {'get': 'list'})
+        request = RequestFactory().get(url)
+        response = async_to_sync(view)(request, title_id=review.title_id)
+        assert response.status_code == 200
+        assert response.content == expected.content, (
+            'Проверьте, что асинхронный путь отдаёт тот же ответ'
+        )
+
+    @override_settings(REQUEST_TIMING_HEADER=True)
+    def test_asgi_middleware_chain(self, review):
+        from django.test import AsyncClient
+
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = async_to_sync(AsyncClient().get)(url)
+        assert response.status_code == 200
+        assert 'queries' in response['Server-Timing']
@@ -0,0 +1,136 @@
+import runpy
+from os.path import join
+
+import pytest
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .conftest import root_dir
+
+USER_QUERY = 'FROM "users_user" WHERE "users_user"."id"'
+
+
+def user_queries(client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(url, **kwargs)
+    return response, sum(
+        USER_QUERY in query['sql'] for query in queries.captured_queries
+    )
+
+
+def signed_in_client(user):
+    from api.authentication import get_access_token
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCachedAuthentication:
+
+    def test_user_is_cached(self, admin_client):
+        _, first = user_queries(admin_client, 'get', '/api/v1/users/')
+        response, second = user_queries(admin_client, 'get', '/api/v1/users/')
+        assert response.status_code == 200
+        assert first == 1
+        assert second == 0, (
+            'Проверьте, что пользователь из токена берётся из кэша'
+        )
+
+    def test_save_invalidates(self, admin, admin_client):
+        admin_client.get('/api/v1/users/')
+        admin.role = admin.USER
+        admin.is_staff = admin.is_superuser = False
+        admin.save()
+        response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 403, (
+            'Проверьте, что изменение пользователя сбрасывает его кэш'
+        )
+
+    def test_delete_invalidates(self, user, user_client):
+        user_client.get('/api/v1/users/me/')
+        user.delete()
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 401
+
+    def test_invalidates_after_commit(self, user, user_client):
+        from api.authentication import USER_KEY
+        from api.cache import get_cache
+
+        user_client.get('/api/v1/users/me/')
+        key = USER_KEY.format(user.pk)
+        with transaction.atomic():
+            user.save()
+            assert get_cache().get(key) is not None
+            # Читатель до фиксации снова кладёт в кэш старую запись.
+            user_client.get('/api/v1/users/me/')
+        assert get_cache().get(key) is None, (
+            'Проверьте, что кэш пользователя сбрасывается после фиксации '
+            'транзакции'
+        )
+
+    def test_password_is_not_cached(self, user, user_client):
+        from api.authentication import USER_KEY
+        from api.cache import get_cache
+
+        user_client.get('/api/v1/users/me/')
+        assert user.password not in get_cache().get(USER_KEY.format(user.id))
+
+    @override_settings(JWT_TRUST_ROLE_CLAIMS=True)
+    def test_trusted_role_claims(self, admin, user, title):
+        client = signed_in_client(admin)
+        response, queries = user_queries(
+            client, 'get', f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        assert queries == 0, (
+            'Проверьте, что при JWT_TRUST_ROLE_CLAIMS чтение не загружает '
+            'пользователя'
+        )
+
+        client = signed_in_client(user)
+        response, queries = user_queries(
+            client, 'post', f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'text', 'score': 5}
+        )
+        assert response.status_code == 201
+        assert queries == 1, (
+            'Проверьте, что запросы на запись загружают пользователя из базы'
+        )
+        assert client.get('/api/v1/users/').status_code == 403
+
+    @override_settings(JWT_TRUST_ROLE_CLAIMS=True)
+    def test_admin_reads_check_database(self, admin):
+        client = signed_in_client(admin)
+        response, queries = user_queries(client, 'get', '/api/v1/users/')
+        assert response.status_code == 200
+        assert queries == 1, (
+            'Проверьте, что права администратора проверяются по базе, '
+            'а не по роли в токене'
+        )
+
+        admin.role = admin.USER
+        admin.is_staff = admin.is_superuser = False
+        admin.save()
+        for url in ('/api/v1/users/', '/api/v1/export/users.csv'):
+            assert client.get(url).status_code == 403, (
+                'Проверьте, что разжалованный администратор теряет доступ '
+                'сразу, а не с новым токеном'
+            )
+        admin.delete()
+        assert client.get('/api/v1/users/').status_code == 403
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('True', True), ('False', False), ('0', False), ('', False),
+])
+def test_trust_role_claims_flag(monkeypatch, value, expected):
+    monkeypatch.setenv('JWT_TRUST_ROLE_CLAIMS', value)
+    settings = runpy.run_path(
+        join(root_dir, 'api_yamdb', 'api_yamdb', 'settings.py'))
+    assert settings['JWT_TRUST_ROLE_CLAIMS'] is expected, (
+        'Проверьте, что роль из токена используется только при '
+        'JWT_TRUST_ROLE_CLAIMS=True'
+    )
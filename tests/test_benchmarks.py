@@ -0,0 +1,40 @@
+import copy
+
+from benchmarks.endpoints import compare
+
+BASELINE = {
+    'meta': {'scale': 0.001},
+    'routes': {
+        'title-list': {
+            'status': 200, 'p50_ms': 1.0, 'queries_cold': 3, 'queries': 0,
+        },
+    },
+}
+
+
+class TestBenchmarkCompare:
+
+    def test_no_regression(self):
+        results = copy.deepcopy(BASELINE)
+        results['routes']['title-list']['p50_ms'] = 1.4
+        assert compare(results, BASELINE, tolerance=0.5) == []
+
+    def test_regressions(self):
+        results = copy.deepcopy(BASELINE)
+        route = results['routes']['title-list']
+        route['p50_ms'] = 2.0
+        route['queries'] = 1
+        problems = compare(results, BASELINE, tolerance=0.5)
+        assert len(problems) == 2, (
+            'Проверьте, что рост задержки и числа запросов считаются '
+            'регрессией'
+        )
+
+    def test_missing_route_and_scale(self):
+        results = copy.deepcopy(BASELINE)
+        results['routes'] = {}
+        assert compare(results, BASELINE, tolerance=0.5) == [
+            'title-list: маршрут не замерен'
+        ]
+        results['meta']['scale'] = 0.01
+        assert len(compare(results, BASELINE, tolerance=0.5)) == 1
@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkCreate:
+
+    def test_categories_and_genres(self, admin_client, category):
+        response = admin_client.post('/api/v1/categories/bulk/', [
+            {'name': 'Книга', 'slug': 'book'},
+            {'name': 'Музыка', 'slug': 'music'},
+        ], format='json')
+        assert response.status_code == 201, response.json()
+        assert [item['slug'] for item in response.json()] == [
+            'book', 'music'
+        ]
+        response = admin_client.get('/api/v1/categories/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что пакетное создание сбрасывает кэш списка'
+        )
+
+        response = admin_client.post('/api/v1/genres/bulk/', [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Драма', 'slug': 'drama'},
+        ], format='json')
+        assert response.status_code == 400
+        assert response.json() == [{}, {'slug': [
+            'Значения поля должны быть уникальны.'
+        ]}], (
+            'Проверьте, что повтор slug внутри пачки возвращает ошибку '
+            'у соответствующего элемента'
+        )
+
+    def test_titles(self, admin_client, category, genres):
+        items = [
+            {'name': f'Фильм {i}', 'year': 2000 + i, 'category': 'movie',
+             'genre': ['drama', 'comedy']}
+            for i in range(10)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(
+                '/api/v1/titles/bulk/', items, format='json')
+        assert response.status_code == 201, response.json()
+        data = response.json()
+        assert len(data) == 10
+        assert data[0]['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert {genre['slug'] for genre in data[0]['genre']} == {
+            'drama', 'comedy'
+        }
+        selects = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'reviews_title_genre' not in query['sql']
+        ]
+        assert len(selects) <= 3, (
+            'Проверьте, что категории и жанры пачки ищутся одним запросом '
+            'на модель'
+        )
+
+        response = admin_client.get('/api/v1/titles/', {'genre': 'comedy'})
+        assert response.json()['count'] == 10
+
+    def test_errors_roll_back_batch(self, admin_client, category, genres):
+        response = admin_client.post('/api/v1/titles/bulk/', [
+            {'name': 'Фильм', 'year': 2000, 'category': 'movie',
+             'genre': ['drama']},
+            {'name': 'Фильм', 'year': 2000, 'category': 'book',
+             'genre': ['drama', 'horror']},
+            {'name': 'Фильм', 'category': 'movie', 'genre': []},
+        ], format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert set(errors[1]) == {'category', 'genre'}
+        assert 'horror' in errors[1]['genre'][0]
+        assert set(errors[2]) == {'year'}
+        response = admin_client.get('/api/v1/titles/')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что при ошибке не создаётся ни один объект пачки'
+        )
+
+    def test_permissions(self, user_client, client):
+        for api_client in (user_client, client):
+            response = api_client.post(
+                '/api/v1/genres/bulk/', [{'name': 'a', 'slug': 'a'}],
+                content_type='application/json')
+            assert response.status_code in (401, 403)
+
+    def test_not_a_list(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/bulk/', {'name': 'a', 'slug': 'a'},
+            format='json')
+        assert response.status_code == 400
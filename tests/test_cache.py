@@ -0,0 +1,87 @@
+import pytest
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    def _get(self, client, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        assert response.status_code == 200
+        return response, len(queries)
+
+    def test_hit_skips_database(self, client, category):
+        response, _ = self._get(client, '/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS'
+        response, queries = self._get(client, '/api/v1/categories/')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный запрос отдаётся из кэша'
+        )
+        assert queries == 0, (
+            'Проверьте, что ответ из кэша не обращается к базе данных'
+        )
+        response, _ = self._get(client, '/api/v1/categories/', limit=1)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что строка запроса входит в ключ кэша'
+        )
+
+    def test_role_is_part_of_key(self, client, admin_client, category):
+        self._get(client, '/api/v1/categories/')
+        response, _ = self._get(admin_client, '/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что роль пользователя входит в ключ кэша'
+        )
+
+    def test_invalidation(self, client, user, title):
+        from reviews.models import Genre, Review
+
+        url = f'/api/v1/titles/{title.id}/'
+        self._get(client, url)
+        Review.objects.create(title=title, author=user, text='t', score=8)
+        response, _ = self._get(client, url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что новый отзыв сбрасывает кэш произведений'
+        )
+        assert response.json()['rating'] == 8
+
+        Genre.objects.filter(slug='drama').get().delete()
+        response, _ = self._get(client, url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение жанров сбрасывает кэш произведений'
+        )
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'comedy'
+        ]
+
+    def test_invalidation_after_commit(self, client, category):
+        from reviews.models import Category
+
+        self._get(client, '/api/v1/categories/')
+        with transaction.atomic():
+            Category.objects.create(name='Сериал', slug='series')
+            response, _ = self._get(client, '/api/v1/categories/')
+            assert response['X-Cache'] == 'HIT', (
+                'Проверьте, что кэш сбрасывается только после фиксации '
+                'транзакции'
+            )
+        response, _ = self._get(client, '/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 2
+
+    def test_file_based_backend(self, client, category, tmp_path):
+        backend = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }
+        with override_settings(CACHES={'default': backend}):
+            self._get(client, '/api/v1/categories/')
+            response, _ = self._get(client, '/api/v1/categories/')
+            assert response['X-Cache'] == 'HIT'
+            category.name = 'Кино'
+            category.save()
+            response, _ = self._get(client, '/api/v1/categories/')
+            assert response['X-Cache'] == 'MISS'
+            assert response.json()['results'][0]['name'] == 'Кино'
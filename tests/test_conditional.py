@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    def test_reviews_etag(self, client, review, another_user):
+        from reviews.models import Review
+
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag, 'Проверьте, что список отзывов отдаёт заголовок ETag'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении ETag возвращается 304'
+        )
+        assert not response.content
+        assert response['ETag'] == etag
+        assert len(queries) <= 2, (
+            'Проверьте, что ответ 304 не выполняет выборку отзывов'
+        )
+
+        Review.objects.create(
+            title=review.title, author=another_user, text='t', score=1
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag списка'
+        )
+
+    def test_same_second_edit_changes_validator(self, client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что Last-Modified с точностью до секунды не '
+            'отдаётся: ETag точнее'
+        )
+        review.text = 'Исправлено'
+        review.save()
+        for headers in (
+            {'HTTP_IF_NONE_MATCH': etag},
+            {'HTTP_IF_MODIFIED_SINCE': 'Fri, 01 Jan 2100 00:00:00 GMT'},
+        ):
+            response = client.get(url, **headers)
+            assert response.status_code == 200, (
+                'Проверьте, что правка в ту же секунду меняет ответ'
+            )
+            assert response.data['text'] == 'Исправлено'
+
+    def test_author_rename_changes_etag(self, client, review):
+        title_url = f'/api/v1/titles/{review.title_id}/reviews/'
+        for url in (title_url, f'{title_url}{review.id}/'):
+            etag = client.get(url)['ETag']
+            review.author.username = f'renamed{len(url)}'
+            review.author.save()
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                'Проверьте, что переименование автора меняет ETag отзывов'
+            )
+            assert review.author.username in str(response.data)
+
+    def test_titles_etag_without_queries(self, client, title, category):
+        url = f'/api/v1/titles/{title.id}/'
+        etag = client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert len(queries) == 0, (
+            'Проверьте, что ETag произведений строится по версиям в кэше'
+        )
+        category.name = 'Кино'
+        category.save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,91 @@
+import json
+from io import StringIO
+from os.path import join
+
+import pytest
+from django.core.management import call_command
+
+from .test_import_data import DATA_DIR
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExportData:
+
+    def test_roundtrip_with_import(self, tmp_path):
+        from reviews.export import EXPORT_HANDLE
+        from reviews.models import Review, Title
+
+        call_command('import_data', path=DATA_DIR, stdout=StringIO())
+        Title.objects.filter(pk=1).update(description='Описание, "с кавычками"')
+        fields = ('id', 'name', 'rating', 'description')
+        titles = sorted(Title.objects.values_list(*fields))
+        call_command('export_data', path=str(tmp_path), stdout=StringIO())
+        for name in EXPORT_HANDLE:
+            with open(join(DATA_DIR, f'{name}.csv'), encoding='utf8') as f:
+                expected = f.readline().strip()
+            exported = (tmp_path / f'{name}.csv').read_text('utf8')
+            assert exported.splitlines()[0].startswith(expected), (
+                f'Проверьте, что заголовок {name}.csv совпадает с форматом '
+                'import_data'
+            )
+
+        call_command('flush', interactive=False, verbosity=0)
+        call_command('import_data', path=str(tmp_path), stdout=StringIO())
+        assert sorted(Title.objects.values_list(*fields)) == titles, (
+            'Проверьте, что выгрузка загружается обратно без потерь'
+        )
+        assert Review.objects.count() > 0
+
+        again = tmp_path / 'again'
+        call_command('export_data', path=str(again), stdout=StringIO())
+        for name in EXPORT_HANDLE:
+            assert (again / f'{name}.csv').read_bytes() == (
+                tmp_path / f'{name}.csv').read_bytes(), (
+                f'Проверьте, что {name}.csv после import_data выгружается '
+                'без изменений: даты, пароли и флаги пользователей '
+                'должны сохраняться'
+            )
+
+    def test_users_keep_passwords_and_flags(self, tmp_path):
+        from users.models import User
+
+        admin = User.objects.create_superuser(
+            username='root', email='root@yamdb.fake',
+            password='secret-password')
+        call_command('export_data', path=str(tmp_path), stdout=StringIO())
+        call_command('flush', interactive=False, verbosity=0)
+        call_command('import_data', path=str(tmp_path), stdout=StringIO())
+        imported = User.objects.get(pk=admin.pk)
+        assert imported.check_password('secret-password'), (
+            'Проверьте, что выгрузка сохраняет хэши паролей'
+        )
+        assert (imported.is_staff, imported.is_superuser) == (True, True), (
+            'Проверьте, что выгрузка сохраняет флаги пользователей'
+        )
+        assert imported.date_joined == admin.date_joined
+
+    def test_streaming_endpoint(self, admin_client, user_client, review):
+        url = '/api/v1/export/review.ndjson'
+        assert user_client.get(url).status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоковым ответом'
+        )
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert rows == [{
+            'id': review.id, 'title_id': review.title_id,
+            'text': review.text, 'author': review.author_id,
+            'score': review.score, 'pub_date': review.pub_date.isoformat(),
+        }]
+
+        response = admin_client.get('/api/v1/export/titles.csv')
+        assert response['Content-Type'].startswith('text/csv')
+        assert b''.join(response.streaming_content).decode().startswith(
+            'id,name,year,category,description\r\n'
+        )
@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture
+def listing(title, review, another_user, genres):
+    from reviews.models import Comment, Review, Title
+
+    Title.objects.create(name='Без категории', year=2001)
+    other = Title.objects.create(
+        name='Другое', year=2002, category=title.category,
+        description='Описание'
+    )
+    other.genre.set(genres[:1])
+    Review.objects.create(
+        title=title, author=another_user, text='Хорошо', score=6
+    )
+    for author in (review.author, another_user):
+        Comment.objects.create(review=review, author=author, text='Да')
+    base = f'/api/v1/titles/{title.id}/reviews/'
+    return {
+        'title': ('/api/v1/titles/', [
+            {}, {'limit': 2, 'offset': 1}, {'genre': 'drama'},
+            {'search': 'другое'}, {'ordering': 'year'},
+        ]),
+        'reviews': (base, [
+            {}, {'limit': 1}, {'pagination': 'cursor', 'limit': 1},
+        ]),
+        'comments': (f'{base}{review.id}/comments/', [
+            {}, {'pagination': 'cursor'},
+        ]),
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFastList:
+
+    @pytest.mark.parametrize('basename', ('title', 'reviews', 'comments'))
+    def test_identical_output(self, client, listing, basename, monkeypatch):
+        from api.urls import router_v1
+
+        viewset = next(
+            viewset for _, viewset, name in router_v1.registry
+            if name == basename
+        )
+        url, variants = listing[basename]
+        for params in variants:
+            fast = client.get(url, params)
+            cache.clear()
+            monkeypatch.setattr(viewset, 'fast_list', False)
+            slow = client.get(url, params)
+            monkeypatch.undo()
+            cache.clear()
+            assert fast.status_code == slow.status_code == 200
+            assert fast.content == slow.content, (
+                f'Проверьте, что быстрый путь для {url} с параметрами '
+                f'{params} отдаёт тот же JSON, что и сериализатор'
+            )
+
+    def test_fieldset_uses_serializer(self, client, listing):
+        response = client.get('/api/v1/titles/', {'fields': 'id,name'})
+        assert set(response.json()['results'][0]) == {'id', 'name'}
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTitleFieldsets:
+    url = '/api/v1/titles/'
+
+    def _get(self, client, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.url, params)
+        assert response.status_code == 200, response.json()
+        return response.json()['results'][0], [
+            query['sql'] for query in queries.captured_queries
+        ]
+
+    def test_default_output_unchanged(self, client, title):
+        data, _ = self._get(client)
+        assert set(data) == {
+            'id', 'name', 'year', 'genre', 'category', 'description', 'rating'
+        }
+        assert data['category'] == {'name': 'Фильм', 'slug': 'movie'}
+
+    def test_fields(self, client, title):
+        data, queries = self._get(client, fields='id,name,rating')
+        assert data == {
+            'id': title.id, 'name': title.name, 'rating': None
+        }, 'Проверьте, что ?fields= оставляет в ответе только эти поля'
+        select = next(sql for sql in queries if 'FROM "reviews_title"' in sql
+                      and 'COUNT' not in sql)
+        assert '"description"' not in select, (
+            'Проверьте, что незапрошенные поля не загружаются из базы'
+        )
+        assert 'reviews_category' not in ''.join(queries)
+        assert 'reviews_genre' not in ''.join(queries), (
+            'Проверьте, что жанры не загружаются, если они не запрошены'
+        )
+
+    def test_expand(self, client, title):
+        data, _ = self._get(client, expand='category')
+        assert data['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert sorted(data['genre']) == ['comedy', 'drama'], (
+            'Проверьте, что неразвёрнутые связи выводятся как slug'
+        )
+        data, _ = self._get(client, fields='name,genre', expand='')
+        assert set(data) == {'name', 'genre'}
+        assert sorted(data['genre']) == ['comedy', 'drama']
+
+    def test_retrieve(self, client, title):
+        response = client.get(
+            f'{self.url}{title.id}/', {'fields': 'name,category'}
+        )
+        assert response.json() == {
+            'name': title.name, 'category': {'name': 'Фильм', 'slug': 'movie'}
+        }
+
+    def test_unknown_fields(self, client, title):
+        response = client.get(self.url, {'fields': 'name,password'})
+        assert response.status_code == 400
+        assert 'fields' in response.json()
+        response = client.get(self.url, {'expand': 'name'})
+        assert response.status_code == 400
+        assert 'expand' in response.json()
@@ -0,0 +1,116 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+SCALE = 0.02
+
+
+def read_csv(path):
+    with open(path, encoding='utf8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGenerateData:
+
+    def test_same_seed_same_data(self, tmp_path):
+        for name, seed in (('a', 1), ('b', 1), ('c', 2)):
+            call_command(
+                'generate_data', scale=SCALE, seed=seed,
+                csv_dir=str(tmp_path / name), stdout=StringIO())
+        first = (tmp_path / 'a' / 'review.csv').read_text(encoding='utf8')
+        assert first == (tmp_path / 'b' / 'review.csv').read_text(
+            encoding='utf8'), (
+            'Проверьте, что при одном seed данные совпадают'
+        )
+        assert first != (tmp_path / 'c' / 'review.csv').read_text(
+            encoding='utf8'), (
+            'Проверьте, что seed влияет на данные'
+        )
+
+    def test_distributions(self, tmp_path):
+        # На малом масштабе популярные произведения упираются в число
+        # пользователей, поэтому данных нужно больше.
+        call_command('generate_data', scale=0.2, csv_dir=str(tmp_path),
+                     stdout=StringIO())
+        reviews = read_csv(tmp_path / 'review.csv')
+        pairs = {(row['author'], row['title_id']) for row in reviews}
+        assert len(pairs) == len(reviews), (
+            'Проверьте, что пара (автор, произведение) у отзывов уникальна'
+        )
+        per_title = {}
+        for row in reviews:
+            per_title[row['title_id']] = per_title.get(row['title_id'], 0) + 1
+        counts = sorted(per_title.values())
+        assert counts[-1] > 5 * counts[len(counts) // 2], (
+            'Проверьте, что популярность произведений неравномерна'
+        )
+        high = sum(int(row['score']) >= 7 for row in reviews)
+        assert high > len(reviews) / 2, (
+            'Проверьте, что оценки смещены к высоким'
+        )
+
+    def test_csv_is_importable(self, tmp_path):
+        from reviews.models import Review, Title
+
+        call_command('generate_data', scale=SCALE, csv_dir=str(tmp_path),
+                     stdout=StringIO())
+        err = StringIO()
+        call_command('import_data', path=str(tmp_path), strict=True,
+                     stdout=StringIO(), stderr=err)
+        assert not err.getvalue()
+        assert Review.objects.count() == len(
+            read_csv(tmp_path / 'review.csv'))
+        assert Title.objects.filter(rating__isnull=False).exists()
+
+    def test_database_matches_csv(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        call_command('generate_data', scale=SCALE, csv_dir=str(tmp_path),
+                     stdout=StringIO())
+        call_command('generate_data', scale=SCALE, chunk_size=100,
+                     stdout=StringIO())
+        reviews = read_csv(tmp_path / 'review.csv')
+        assert sorted(Review.objects.values_list(
+            'id', 'title_id', 'author_id', 'score')) == sorted(
+            (int(row['id']), int(row['title_id']), int(row['author']),
+             int(row['score'])) for row in reviews
+        ), (
+            'Проверьте, что запись в базу и выгрузка в csv дают одни данные'
+        )
+        assert Comment.objects.count() == len(
+            read_csv(tmp_path / 'comments.csv'))
+        assert Title.objects.filter(rating__isnull=False).exists()
+        Title.objects.create(name='Новое', year=2000)
+
+    def test_database_keeps_pub_dates(self, tmp_path):
+        from datetime import timedelta
+
+        from django.db.models import Max, Min
+        from reviews.models import Comment, Review
+
+        call_command('generate_data', scale=SCALE, csv_dir=str(tmp_path),
+                     stdout=StringIO())
+        call_command('generate_data', scale=SCALE, stdout=StringIO())
+        reviews = read_csv(tmp_path / 'review.csv')
+        assert sorted(
+            (pk, pub_date.isoformat()) for pk, pub_date
+            in Review.objects.values_list('id', 'pub_date')
+        ) == sorted((int(row['id']), row['pub_date']) for row in reviews), (
+            'Проверьте, что generate_data записывает в базу '
+            'сгенерированные даты публикации'
+        )
+        for model in (Review, Comment):
+            spread = model.objects.aggregate(
+                first=Min('pub_date'), last=Max('pub_date'))
+            assert spread['last'] - spread['first'] > timedelta(days=365), (
+                'Проверьте, что даты публикации распределены по истории, '
+                'а не равны времени запуска'
+            )
+
+    def test_refuses_non_empty_database(self):
+        call_command('generate_data', scale=SCALE, stdout=StringIO())
+        with pytest.raises(CommandError):
+            call_command('generate_data', scale=SCALE, stdout=StringIO())
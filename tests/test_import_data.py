@@ -0,0 +1,221 @@
+from io import StringIO
+from os.path import join
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from .conftest import root_dir
+
+DATA_DIR = join(root_dir, 'api_yamdb', 'users', 'static', 'data')
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    (tmp_path / 'category.csv').write_text(
+        'id,name,slug\n1,Фильм,movie\n2,Книга,book\n', encoding='utf8'
+    )
+    (tmp_path / 'titles.csv').write_text(
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Битый год,не год,1\n'
+        '3,Война и мир,1869,2\n',
+        encoding='utf8'
+    )
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImportData:
+
+    def test_import_in_chunks(self, csv_dir):
+        from reviews.models import Category, Title
+
+        out, err = StringIO(), StringIO()
+        call_command(
+            'import_data', path=str(csv_dir), chunk_size=1, batch_size=1,
+            defer_indexes=True, stdout=out, stderr=err
+        )
+        assert Category.objects.count() == 2
+        assert set(Title.objects.values_list('id', flat=True)) == {1, 3}, (
+            'Проверьте, что ошибочные строки пропускаются'
+        )
+        assert 'строка 3' in err.getvalue(), (
+            'Проверьте, что о пропущенных строках сообщается с номером строки'
+        )
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что команда сообщает о скорости импорта'
+        )
+
+    def test_broken_rows_are_reported(self, csv_dir):
+        from reviews.models import Title
+
+        (csv_dir / 'titles.csv').write_text(
+            'id,name,year,category\n'
+            '1,Побег из Шоушенка,1994,1\n'
+            '2,Лишний столбец,1994,1,2\n'
+            '3,Без года\n'
+            '4,Без категории,2000,7\n'
+            '1,Повтор,1994,1\n',
+            encoding='utf8'
+        )
+        out, err = StringIO(), StringIO()
+        call_command('import_data', path=str(csv_dir), stdout=out, stderr=err)
+        assert list(Title.objects.values_list('id', flat=True)) == [1]
+        for line in ('строка 3', 'строка 4', 'строка 5'):
+            assert line in err.getvalue(), (
+                'Проверьте, что строки с лишними или недостающими '
+                'значениями и ссылками на несуществующие объекты '
+                'пропускаются с сообщением'
+            )
+        assert 'titles.csv: добавлено объектов: 1; пропущено строк: 3' in (
+            out.getvalue()
+        ), 'Проверьте, что считаются только действительно добавленные строки'
+
+    def test_strict_rolls_back(self, csv_dir):
+        from reviews.models import Category, Title
+
+        with pytest.raises(CommandError):
+            call_command(
+                'import_data', path=str(csv_dir), strict=True, atomic='run',
+                stdout=StringIO(), stderr=StringIO()
+            )
+        assert not Category.objects.exists() and not Title.objects.exists(), (
+            'Проверьте, что при --strict --atomic=run импорт откатывается'
+        )
+
+    def test_rows_without_ids(self, tmp_path):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Category
+
+        (tmp_path / 'category.csv').write_text(
+            'name,slug\nФильм,movie\nКнига,book\nПовтор,movie\n',
+            encoding='utf8'
+        )
+        for added in (2, 0):
+            out = StringIO()
+            with CaptureQueriesContext(connection) as queries:
+                call_command('import_data', path=str(tmp_path), stdout=out,
+                             stderr=StringIO())
+            assert f'category.csv: добавлено объектов: {added};' in (
+                out.getvalue()), (
+                'Проверьте, что строки без id считаются по уникальным полям'
+            )
+            assert not any(
+                'COUNT(' in query['sql'] and 'reviews_category' in query['sql']
+                for query in queries.captured_queries
+            ), 'Проверьте, что импорт не пересчитывает всю таблицу'
+        assert Category.objects.count() == 2
+
+    def test_write_transaction_locks_immediately(self):
+        import sqlite3
+
+        from django.db import connection
+        from reviews.management.commands.import_data import (
+            write_transaction)
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('BEGIN IMMEDIATE есть только в SQLite')
+        other = sqlite3.connect(connection.settings_dict['NAME'], timeout=0)
+        try:
+            with write_transaction('default'):
+                with pytest.raises(sqlite3.OperationalError):
+                    other.execute('BEGIN IMMEDIATE')
+            other.execute('BEGIN IMMEDIATE')
+            other.rollback()
+        finally:
+            other.close()
+
+    def _snapshot(self):
+        from reviews.management.commands.import_data import FILE_HANDLE
+
+        snapshot = {}
+        for file, model, replace, _ in FILE_HANDLE:
+            # Сравниваются все столбцы файла, в том числе даты.
+            with open(join(DATA_DIR, file), encoding='utf8') as f:
+                header = f.readline().strip().split(',')
+            fields = [replace.get(column, column) for column in header]
+            snapshot[file] = sorted(model.objects.values_list(*fields))
+        return snapshot
+
+    def test_keeps_pub_dates(self):
+        from reviews.models import Comment, Review
+
+        call_command('import_data', path=DATA_DIR, stdout=StringIO())
+        pub_date = Review.objects.get(pk=1).pub_date
+        assert pub_date.isoformat() == '2019-09-24T21:08:21.567000+00:00', (
+            'Проверьте, что import_data сохраняет даты публикации из файла'
+        )
+        assert Comment.objects.filter(pub_date__year=2020).exists()
+
+    @pytest.mark.parametrize('workers', (1, 2))
+    def test_resets_sequences(self, monkeypatch, workers):
+        from django.db import connection
+        from reviews.management.commands.import_data import FILE_HANDLE
+
+        reset = []
+        original = type(connection.ops).sequence_reset_sql
+
+        def sequence_reset_sql(ops, style, models):
+            reset.extend(models)
+            return original(ops, style, models)
+
+        monkeypatch.setattr(
+            type(connection.ops), 'sequence_reset_sql', sequence_reset_sql)
+        call_command('import_data', path=DATA_DIR, workers=workers,
+                     stdout=StringIO())
+        assert reset == [model for _, model, _, _ in FILE_HANDLE], (
+            'Проверьте, что после импорта счётчики первичных ключей '
+            'сдвигаются за загруженные значения'
+        )
+
+    @pytest.mark.parametrize('workers', (1, 2))
+    def test_deferred_indexes_are_restored(self, workers):
+        from django.db import connection
+        from reviews.management.commands.import_data import (
+            FILE_HANDLE, INDEX_DEFINITIONS)
+
+        def definitions():
+            found = {}
+            with connection.cursor() as cursor:
+                for _, model, _, _ in FILE_HANDLE:
+                    table = model._meta.db_table
+                    cursor.execute(
+                        INDEX_DEFINITIONS[connection.vendor], [table])
+                    found[table] = sorted(cursor.fetchall())
+            return found
+
+        # Условие, как и класс операторов, не видно в get_constraints.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE INDEX review_high_score ON reviews_review (score) '
+                'WHERE score > 5')
+        try:
+            before = definitions()
+            call_command('import_data', path=DATA_DIR, workers=workers,
+                         defer_indexes=True, stdout=StringIO())
+            assert definitions() == before, (
+                'Проверьте, что --defer-indexes восстанавливает индексы '
+                'по их сохранённым определениям'
+            )
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('DROP INDEX IF EXISTS review_high_score')
+
+    def test_parallel_matches_serial(self):
+        from reviews.models import Title
+
+        call_command('import_data', path=DATA_DIR, stdout=StringIO())
+        serial = self._snapshot()
+        ratings = sorted(Title.objects.values_list('id', 'rating'))
+        call_command('flush', interactive=False, verbosity=0)
+
+        call_command(
+            'import_data', path=DATA_DIR, workers=3, chunk_size=7,
+            defer_indexes=True, stdout=StringIO()
+        )
+        assert self._snapshot() == serial, (
+            'Проверьте, что параллельный импорт даёт ту же базу, '
+            'что и последовательный'
+        )
+        assert sorted(Title.objects.values_list('id', 'rating')) == ratings
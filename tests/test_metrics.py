@@ -0,0 +1,190 @@
+import multiprocessing
+import re
+import runpy
+import threading
+from os.path import join
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from .conftest import root_dir
+
+
+def sample(text, name, **labels):
+    """Значение строки метрики с подмножеством labels или None."""
+    for line in text.splitlines():
+        match = re.match(rf'{name}(?:{{(.*)}})? (\S+)$', line)
+        if match and all(
+            f'{key}="{value}"' in (match.group(1) or '')
+            for key, value in labels.items()
+        ):
+            return float(match.group(2))
+    return None
+
+
+def record_in_child(directory):
+    from api.metrics import MetricsStore
+
+    store = MetricsStore(directory, flush_interval=3600)
+    store.inc('yamdb_http_requests_total', {'view': 'Child'}, 2)
+    store.observe('yamdb_http_request_duration_seconds', {'view': 'Child'},
+                  0.3)
+    store.flush()
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    @pytest.fixture(autouse=True)
+    def metrics_dir(self, tmp_path):
+        with override_settings(METRICS_DIR=tmp_path,
+                               METRICS_FLUSH_INTERVAL=3600):
+            yield tmp_path
+
+    def test_only_staff(self, client, user_client):
+        url = reverse('metrics')
+        assert client.get(url).status_code == 401
+        assert user_client.get(url).status_code == 403, (
+            'Проверьте, что метрики доступны только администратору'
+        )
+
+    def test_request_metrics(self, admin_client, user_client, review):
+        url = reverse('api:reviews-list', args=[review.title_id])
+        user_client.get(url)
+        user_client.get(reverse('api:category-list'))
+        user_client.get(reverse('api:category-list'))
+        response = admin_client.get(reverse('metrics'))
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        assert '# TYPE yamdb_http_request_duration_seconds histogram' in text
+        assert sample(
+            text, 'yamdb_http_requests_total',
+            view='ReviewViewSet', action='list', status='200'
+        ) == 1, (
+            'Проверьте, что запросы считаются по представлению, '
+            'действию и коду ответа'
+        )
+        assert sample(
+            text, 'yamdb_http_request_duration_seconds_count',
+            view='CategoryViewSet', action='list'
+        ) == 2
+        assert sample(
+            text, 'yamdb_http_request_duration_seconds_bucket',
+            view='CategoryViewSet', le='+Inf'
+        ) == 2
+        assert sample(
+            text, 'yamdb_db_queries_total', view='ReviewViewSet') >= 2
+        assert sample(
+            text, 'yamdb_cache_requests_total',
+            view='CategoryViewSet', result='hit'
+        ) == 1
+        assert sample(
+            text, 'yamdb_cache_requests_total',
+            view='CategoryViewSet', result='miss'
+        ) == 1
+
+    def test_workers_are_summed(self, admin_client, metrics_dir):
+        from api.metrics import get_store
+
+        get_store().inc('yamdb_http_requests_total', {'view': 'Child'}, 1)
+        context = multiprocessing.get_context('fork')
+        for _ in range(2):
+            process = context.Process(
+                target=record_in_child, args=(str(metrics_dir),))
+            process.start()
+            process.join()
+            assert process.exitcode == 0
+        assert len(list(metrics_dir.glob('*.json'))) == 3
+        text = admin_client.get(reverse('metrics')).content.decode()
+        assert sample(
+            text, 'yamdb_http_requests_total', view='Child') == 5, (
+            'Проверьте, что метрики всех процессов складываются'
+        )
+        assert sample(
+            text, 'yamdb_http_request_duration_seconds_bucket',
+            view='Child', le='0.5'
+        ) == 2
+
+    def test_fork_starts_from_zero(self, metrics_dir):
+        from api.metrics import MetricsStore
+
+        store = MetricsStore(metrics_dir, flush_interval=3600)
+        store.inc('yamdb_http_requests_total', {'view': 'Parent'})
+        store.pid = -1
+        store.inc('yamdb_http_requests_total', {'view': 'Child'})
+        assert list(store.values['yamdb_http_requests_total']) == [
+            '{"view": "Child"}'
+        ]
+
+    def test_concurrent_flushes(self, metrics_dir):
+        from api.metrics import MetricsStore
+
+        store = MetricsStore(metrics_dir, flush_interval=0)
+        errors = []
+
+        def work():
+            try:
+                for _ in range(200):
+                    store.inc('yamdb_http_requests_total', {'view': 'T'})
+            except OSError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, (
+            'Проверьте, что одновременная запись метрик из нескольких '
+            'потоков не падает'
+        )
+        assert store.collect()['yamdb_http_requests_total'] == {
+            '{"view": "T"}': 800
+        }
+        assert not list(metrics_dir.glob('*.tmp'))
+
+    def test_write_error_keeps_response(self, user_client, tmp_path, caplog):
+        blocker = tmp_path / 'file'
+        blocker.write_text('')
+        with override_settings(METRICS_DIR=blocker / 'metrics',
+                               METRICS_FLUSH_INTERVAL=0):
+            response = user_client.get(reverse('api:category-list'))
+        assert response.status_code == 200, (
+            'Проверьте, что ошибка записи метрик не ломает ответ'
+        )
+        assert 'метрики' in caplog.text
+
+    def test_reused_pid_keeps_file(self, metrics_dir):
+        from api.metrics import MetricsStore
+
+        # Новый процесс с pid завершившегося воркера.
+        for view in ('Old', 'New'):
+            store = MetricsStore(metrics_dir, flush_interval=3600)
+            store.inc('yamdb_http_requests_total', {'view': view})
+            store.flush()
+        assert store.collect()['yamdb_http_requests_total'] == {
+            '{"view": "Old"}': 1, '{"view": "New"}': 1,
+        }, (
+            'Проверьте, что процесс с тем же pid не заменяет файл '
+            'завершившегося воркера'
+        )
+
+    def test_server_start_clears_directory(self, metrics_dir):
+        from api.metrics import MetricsStore
+
+        store = MetricsStore(metrics_dir, flush_interval=3600)
+        store.inc('yamdb_http_requests_total', {'view': 'Stale'})
+        store.flush()
+        (metrics_dir / 'stale.123.tmp').write_text('')
+        (metrics_dir / 'keep.txt').write_text('')
+
+        config = runpy.run_path(join(root_dir, 'api_yamdb', 'gunicorn.conf.py'))
+        config['on_starting'](None)
+        assert sorted(path.name for path in metrics_dir.iterdir()) == [
+            'keep.txt'
+        ], (
+            'Проверьте, что при старте gunicorn файлы метрик прежнего '
+            'запуска удаляются'
+        )
@@ -0,0 +1,70 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import override_settings
+
+MIGRATED = 'migrated'
+
+
+@pytest.fixture
+def migrated(transactional_db, tmp_path):
+    """
+    Вторая SQLite-база, собранная файлами миграций. Тестовая база
+    (--nomigrations) строится прямо по моделям.
+    """
+    connections.settings[MIGRATED] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'migrated.sqlite3'),
+    }
+    connections.ensure_defaults(MIGRATED)
+    connections.prepare_test_settings(MIGRATED)
+    with override_settings(MIGRATION_MODULES={}):
+        call_command('migrate', database=MIGRATED, verbosity=0)
+        yield connections[MIGRATED]
+    connections[MIGRATED].close()
+    del connections[MIGRATED]
+    del connections.settings[MIGRATED]
+
+
+def constraints(db, table):
+    with db.cursor() as cursor:
+        found = db.introspection.get_constraints(cursor, table)
+    return {
+        name: (info['columns'], info.get('orders'), info['unique'],
+               info['index'])
+        for name, info in found.items()
+        if info['index'] or info['unique'] and not info['primary_key']
+    }
+
+
+class TestMigrations:
+
+    @override_settings(MIGRATION_MODULES={})
+    def test_no_missing_migrations(self):
+        from django.apps import apps
+        from django.db.migrations.autodetector import MigrationAutodetector
+        from django.db.migrations.loader import MigrationLoader
+        from django.db.migrations.state import ProjectState
+        from django.utils import translation
+
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        # Как и makemigrations, сравниваем без перевода verbose_name.
+        with translation.override(None):
+            changes = MigrationAutodetector(
+                loader.project_state(), ProjectState.from_apps(apps)
+            ).changes(graph=loader.graph)
+        assert not changes, (
+            'Проверьте, что миграции соответствуют моделям: '
+            'makemigrations не должен находить изменений'
+        )
+
+    def test_migrated_schema_matches_models(self, migrated):
+        from reviews.models import Category, Comment, GenreTitle, Review, Title
+
+        for model in (Category, Title, GenreTitle, Review, Comment):
+            table = model._meta.db_table
+            assert constraints(migrated, table) == constraints(
+                connection, table), (
+                f'Проверьте, что миграции создают индексы {table} '
+                'так же, как модели'
+            )
@@ -0,0 +1,158 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('relay unavailable')
+
+
+class CountingBackend(BaseEmailBackend):
+    opened = 0
+
+    def open(self):
+        if getattr(self, 'is_open', False):
+            return False
+        CountingBackend.opened += 1
+        self.is_open = True
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, email_messages):
+        mail.outbox.extend(email_messages)
+        return len(email_messages)
+
+
+class ClaimCheckingBackend(CountingBackend):
+    """Запоминает, что видно в базе в момент отправки письма."""
+    seen = []
+
+    def send_messages(self, email_messages):
+        from django.db import connection
+        from users.models import OutgoingEmail
+
+        ClaimCheckingBackend.seen.append((
+            connection.in_atomic_block,
+            OutgoingEmail.objects.due(5).count(),
+            OutgoingEmail.objects.get().attempts,
+        ))
+        return super().send_messages(email_messages)
+
+
+def signup(client, username):
+    return client.post('/api/v1/auth/signup/', {
+        'username': username, 'email': f'{username}@yamdb.fake'
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOutbox:
+
+    def test_signup_only_enqueues(self, client):
+        from users.models import OutgoingEmail
+
+        response = signup(client, 'reader')
+        assert response.status_code == 200
+        assert mail.outbox == [], (
+            'Проверьте, что регистрация не отправляет письмо синхронно'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'reader@yamdb.fake'
+        assert email.sent_at is None
+
+    def test_worker_reuses_connection(self, client):
+        from users.models import OutgoingEmail
+
+        for i in range(5):
+            signup(client, f'reader{i}')
+        CountingBackend.opened = 0
+        with override_settings(
+            EMAIL_BACKEND='tests.test_outbox.CountingBackend'
+        ):
+            call_command('send_emails', once=True, batch_size=2)
+        assert len(mail.outbox) == 5
+        assert CountingBackend.opened == 1, (
+            'Проверьте, что все пачки отправляются через одно соединение'
+        )
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_retry_with_backoff(self, client):
+        from users.models import OutgoingEmail
+
+        signup(client, 'reader')
+        with override_settings(
+            EMAIL_BACKEND='tests.test_outbox.FailingBackend'
+        ):
+            call_command('send_emails', once=True, backoff=60)
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1
+        assert email.sent_at is None
+        assert 'relay unavailable' in email.last_error
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что повторная попытка откладывается'
+        )
+
+        call_command('send_emails', once=True)
+        assert mail.outbox == [], (
+            'Проверьте, что письмо не отправляется раньше send_after'
+        )
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        call_command('send_emails', once=True)
+        assert len(mail.outbox) == 1
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.attempts == 2
+
+    def test_file_backend(self, client, tmp_path):
+        signup(client, 'reader')
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.filebased.EmailBackend',
+            EMAIL_FILE_PATH=tmp_path,
+        ):
+            call_command('send_emails', once=True)
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert 'reader@yamdb.fake' in files[0].read_text()
+
+    def test_sends_outside_transaction(self, client):
+        from users.models import OutgoingEmail
+
+        signup(client, 'reader')
+        ClaimCheckingBackend.seen = []
+        with override_settings(
+            EMAIL_BACKEND='tests.test_outbox.ClaimCheckingBackend'
+        ):
+            call_command('send_emails', once=True)
+        assert ClaimCheckingBackend.seen == [(False, 0, 1)], (
+            'Проверьте, что письма забираются и фиксируются до отправки, '
+            'а почтовый сервер вызывается вне транзакции'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is not None
+        assert mail.outbox[0].body, 'Проверьте, что письмо ушло с текстом'
+        assert email.message == '', (
+            'Проверьте, что текст с кодом подтверждения стирается '
+            'после отправки'
+        )
+
+    def test_expired_lease_is_retried(self, client):
+        from users.models import OutgoingEmail
+        from users.outbox import claim_batch
+
+        signup(client, 'reader')
+        assert len(claim_batch(10, 5, lease=60)) == 1
+        assert claim_batch(10, 5, lease=60) == [], (
+            'Проверьте, что забранное письмо не достаётся другим обработчикам'
+        )
+        # Обработчик упал, не отметив письмо; аренда истекла.
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        call_command('send_emails', once=True)
+        assert len(mail.outbox) == 1
+        assert OutgoingEmail.objects.get().attempts == 2
@@ -0,0 +1,63 @@
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def reviews(title, django_user_model):
+    from reviews.models import Review
+
+    created = [
+        Review.objects.create(
+            title=title, text='text', score=5,
+            author=django_user_model.objects.create_user(
+                username=f'author{i}', email=f'author{i}@yamdb.fake'
+            )
+        )
+        for i in range(5)
+    ]
+    Review.objects.filter(pk__in=[r.pk for r in created[1:4]]).update(
+        pub_date=timezone.now()
+    )
+    return Review.objects.order_by('-pub_date', '-id')
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCursorPagination:
+
+    def test_offset_is_default(self, client, reviews, title):
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        assert response.json()['count'] == 5, (
+            'Проверьте, что без параметра pagination сохраняется '
+            'постраничный вывод limit/offset'
+        )
+
+    def test_cursor_walks_all_pages(self, client, reviews, title):
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor&limit=2'
+        pages = []
+        while url:
+            data = client.get(url).json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме cursor не выполняется подсчёт записей'
+            )
+            pages.append([review['id'] for review in data['results']])
+            url = data['next']
+        assert sum(pages, []) == [review.id for review in reviews], (
+            'Проверьте, что курсор обходит отзывы по (pub_date, id) '
+            'без пропусков и повторов'
+        )
+
+        previous = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?pagination=cursor&limit=2'
+        ).json()['next']
+        previous = client.get(previous).json()['previous']
+        data = client.get(previous).json()
+        assert [review['id'] for review in data['results']] == pages[0], (
+            'Проверьте, что ссылка previous возвращает предыдущую страницу'
+        )
+
+    def test_invalid_cursor(self, client, title):
+        response = client.get(
+            f'/api/v1/titles/{title.id}/reviews/?pagination=cursor&cursor=bad'
+        )
+        assert response.status_code == 404
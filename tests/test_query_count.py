@@ -0,0 +1,139 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+PAGE_SIZES = (1, 5)
+
+
+def list_endpoints():
+    from api.urls import router_v1
+
+    for prefix, viewset, basename in router_v1.registry:
+        if not hasattr(viewset, 'list'):
+            continue
+        yield pytest.param(
+            basename, re.findall(r'\?P<(\w+)>', prefix), id=basename
+        )
+
+
+@pytest.fixture
+def catalog(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    size = max(PAGE_SIZES)
+    users = [
+        django_user_model.objects.create_user(
+            username=f'user{i}', email=f'user{i}@yamdb.fake'
+        )
+        for i in range(size)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(size)
+    ]
+    titles = []
+    for i in range(size):
+        category = Category.objects.create(
+            name=f'Категория {i}', slug=f'category-{i}'
+        )
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000 + i, category=category
+        )
+        title.genre.set(genres[:i + 1])
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='text', score=5
+        )
+        for author in users
+    ]
+    for author in users:
+        Comment.objects.create(review=reviews[0], author=author, text='text')
+    return {'title_id': titles[0].id, 'review_id': reviews[0].id}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestListQueryCount:
+
+    @pytest.mark.parametrize('basename,url_kwargs', list_endpoints())
+    def test_constant_queries(self, admin_client, catalog, basename,
+                              url_kwargs):
+        url = reverse(
+            f'api:{basename}-list',
+            kwargs={name: catalog[name] for name in url_kwargs}
+        )
+        # Пользователь попадает в кэш аутентификации при первом запросе.
+        admin_client.get(reverse('api:users-me'))
+        counts = []
+        for limit in PAGE_SIZES:
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.get(url, {'limit': limit})
+            assert response.status_code == 200, (
+                f'Проверьте, что эндпоинт {url} доступен администратору'
+            )
+            assert len(response.json()['results']) == limit, (
+                f'Проверьте, что для {url} подготовлено достаточно данных'
+            )
+            counts.append(len(queries))
+        assert len(set(counts)) == 1, (
+            f'Проверьте, что число запросов к БД для {url} не зависит от '
+            f'размера страницы: {dict(zip(PAGE_SIZES, counts))}'
+        )
+
+
+# Ожидаемое число запросов к БД (SQLite, пользователь уже в кэше
+# аутентификации): метод, адрес, клиент, данные, число запросов.
+PINNED_QUERIES = {
+    'review-list': ('get', 'reviews', 'user_client', None, 4),
+    'review-create': (
+        'post', 'reviews', 'another_user_client',
+        {'text': 'text', 'score': 3}, 4
+    ),
+    'review-update': ('patch', 'review', 'user_client', {'text': 'new'}, 5),
+    'review-delete': ('delete', 'review', 'moderator_client', None, 7),
+    'comment-list': ('get', 'comments', 'user_client', None, 4),
+    'comment-create': ('post', 'comments', 'user_client', {'text': 'new'}, 2),
+    'comment-update': (
+        'patch', 'comment', 'moderator_client', {'text': 'new'}, 3
+    ),
+    'comment-delete': ('delete', 'comment', 'user_client', None, 4),
+}
+
+
+@pytest.fixture
+def discussion(review):
+    from reviews.models import Comment
+
+    comment = Comment.objects.create(
+        review=review, author=review.author, text='text'
+    )
+    base = f'/api/v1/titles/{review.title_id}/reviews/'
+    return {
+        'reviews': base,
+        'review': f'{base}{review.id}/',
+        'comments': f'{base}{review.id}/comments/',
+        'comment': f'{base}{review.id}/comments/{comment.id}/',
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPinnedQueryCount:
+
+    @pytest.mark.parametrize('case', PINNED_QUERIES)
+    def test_pinned_queries(self, request, discussion, case):
+        method, target, client_name, data, expected = PINNED_QUERIES[case]
+        client = request.getfixturevalue(client_name)
+        client.get(reverse('api:users-me'))
+        url = discussion[target]
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(client, method)(url, data=data)
+        assert response.status_code < 300, (
+            f'Проверьте, что запрос {method.upper()} {url} выполняется'
+        )
+        assert len(queries) == expected, (
+            f'Проверьте число запросов к БД для {method.upper()} {url}: '
+            f'ожидалось {expected}, выполнено {len(queries)}'
+        )
@@ -0,0 +1,98 @@
+import pytest
+from django.urls import reverse
+
+# Сортировка допустима, если её вход уже ограничен: предвыборка жанров
+# страницы не содержит LIMIT. Фильтр ?genre= идёт от жанра через индекс
+# (genre, title), и произведения жанра приходится сортировать по названию.
+ENDPOINTS = (
+    ('titles', 'api:title-list', (), {}, False),
+    ('titles-category', 'api:title-list', (), {'category': 'movie'}, False),
+    ('titles-year', 'api:title-list', (), {'year': 1994}, False),
+    ('titles-genre', 'api:title-list', (), {'genre': 'drama'}, True),
+    ('categories', 'api:category-list', (), {}, False),
+    ('genres', 'api:genre-list', (), {}, False),
+    ('reviews', 'api:reviews-list', ('title',), {}, False),
+    ('reviews-cursor', 'api:reviews-list', ('title',),
+     {'pagination': 'cursor'}, False),
+    ('comments', 'api:comments-list', ('title', 'review'), {}, False),
+)
+
+
+def capture_selects(client, url, params):
+    from django.db import connection
+
+    queries = []
+
+    def wrapper(execute, sql, sql_params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            queries.append((sql, sql_params))
+        return execute(sql, sql_params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return queries
+
+
+def explain(sql, params):
+    """Строки плана запроса SQLite или PostgreSQL."""
+    from django.db import connection, transaction
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # На нескольких строках PostgreSQL и так выберет Seq Scan.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+        else:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(sql, plan, allow_sort):
+    problems = []
+    paged = ' LIMIT ' in sql.upper()
+    for line in plan:
+        if line.startswith('SCAN') and 'USING' not in line:
+            problems.append(f'полный просмотр таблицы: {line}')
+        if 'Seq Scan' in line:
+            problems.append(f'полный просмотр таблицы: {line.strip()}')
+        sort = 'TEMP B-TREE' in line or line.strip().startswith('Sort ')
+        if sort and paged and not allow_sort:
+            problems.append(f'сортировка без индекса: {line.strip()}')
+    return problems
+
+
+@pytest.mark.django_db
+class TestQueryPlans:
+
+    @pytest.mark.parametrize(
+        'name,url_name,args,params,allow_sort', ENDPOINTS,
+        ids=[endpoint[0] for endpoint in ENDPOINTS],
+    )
+    def test_list_endpoint_uses_indexes(self, user_client, review, user,
+                                        name, url_name, args, params,
+                                        allow_sort):
+        from reviews.models import Comment
+
+        Comment.objects.create(review=review, author=user, text='Согласен')
+        objects = {'title': review.title_id, 'review': review.id}
+        url = reverse(url_name, args=[objects[arg] for arg in args])
+        queries = capture_selects(user_client, url, params)
+        assert queries
+        for sql, sql_params in queries:
+            problems = plan_problems(
+                sql, explain(sql, sql_params), allow_sort)
+            assert not problems, (
+                f'Проверьте индексы для {name}: {problems}\n{sql}'
+            )
+
+    def test_genre_filter_uses_through_index(self, user_client, title):
+        queries = capture_selects(
+            user_client, reverse('api:title-list'), {'genre': 'drama'})
+        plans = [
+            line for sql, sql_params in queries
+            for line in explain(sql, sql_params)
+        ]
+        assert any('title_genre_genre_title_idx' in line for line in plans), (
+            'Проверьте, что фильтр по жанру использует индекс (genre, title)'
+        )
@@ -0,0 +1,55 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTitleRating:
+
+    def _rating(self, title):
+        title.refresh_from_db()
+        return title.rating_sum, title.rating_count, title.rating
+
+    def test_rating_follows_reviews(self, title, user, another_user):
+        from reviews.models import Review
+
+        assert self._rating(title) == (0, 0, None), (
+            'Проверьте, что у произведения без отзывов нет рейтинга'
+        )
+        first = Review.objects.create(
+            title=title, author=user, text='text', score=10
+        )
+        Review.objects.create(
+            title=title, author=another_user, text='text', score=5
+        )
+        assert self._rating(title) == (15, 2, 7), (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва'
+        )
+        first.score = 1
+        first.save()
+        assert self._rating(title) == (6, 2, 3), (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки'
+        )
+        first.delete()
+        assert self._rating(title) == (5, 1, 5), (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва'
+        )
+        another_user.delete()
+        assert self._rating(title) == (0, 0, None), (
+            'Проверьте, что рейтинг пересчитывается при каскадном удалении'
+        )
+
+    def test_rating_in_response(self, client, review):
+        response = client.get(f'/api/v1/titles/{review.title_id}/')
+        assert response.status_code == 200
+        assert response.json()['rating'] == 10, (
+            'Проверьте, что в ответе возвращается сохранённый рейтинг'
+        )
+
+    def test_rebuild_ratings(self, title, review):
+        from reviews.models import Title
+
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rebuild_ratings')
+        assert self._rating(title) == (10, 1, 10), (
+            'Проверьте, что команда rebuild_ratings восстанавливает рейтинг'
+        )
@@ -0,0 +1,98 @@
+import datetime as dt
+import gzip
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+from django.utils.translation import gettext_lazy
+
+
+def sample_data():
+    from rest_framework.exceptions import ErrorDetail
+    from rest_framework.utils.serializer_helpers import ReturnDict
+
+    return {
+        'text': 'Кириллица и "кавычки" \u2028 \u2029',
+        'number': 1.5,
+        'decimal': Decimal('1.10'),
+        'date': dt.date(2022, 1, 2),
+        'moment': dt.datetime(2022, 1, 2, 3, 4, 5, 678901,
+                              tzinfo=dt.timezone.utc),
+        'lazy': gettext_lazy('Not found.'),
+        'error': ErrorDetail('Ошибка', code='invalid'),
+        'nested': ReturnDict([('b', [1, None, True])], serializer=None),
+        5: 'int key',
+    }
+
+
+class TestFastJSONRenderer:
+
+    def test_output_matches_drf(self):
+        from api.renderers import FastJSONRenderer, orjson
+        from rest_framework.renderers import JSONRenderer
+
+        assert orjson is not None
+        data = sample_data()
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), 'Проверьте, что рендерер на orjson выводит тот же JSON, что DRF'
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        from api import renderers
+        from rest_framework.renderers import JSONRenderer
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        data = sample_data()
+        assert renderers.FastJSONRenderer().render(
+            data) == JSONRenderer().render(data)
+
+    def test_indent_uses_drf(self):
+        from api.renderers import FastJSONRenderer
+
+        rendered = FastJSONRenderer().render(
+            {'a': 1}, 'application/json; indent=2')
+        assert rendered == b'{\n  "a": 1\n}'
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAPIGZip:
+
+    @pytest.fixture
+    def titles(self, category):
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000, category=category,
+                  description='Описание ' * 20)
+            for i in range(10)
+        )
+
+    def test_large_response_compressed(self, client, titles):
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        plain = client.get('/api/v1/titles/')
+        assert gzip.decompress(response.content) == plain.content
+        assert len(response.content) < len(plain.content)
+
+    def test_min_size(self, client, titles):
+        with override_settings(API_GZIP_MIN_SIZE=10 ** 6):
+            response = client.get(
+                '/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы короче API_GZIP_MIN_SIZE не сжимаются'
+        )
+
+    def test_streaming_not_compressed(self, admin_client, titles):
+        response = admin_client.get(
+            '/api/v1/export/titles.ndjson', HTTP_ACCEPT_ENCODING='gzip')
+        assert response.streaming
+        assert not response.has_header('Content-Encoding')
+
+    def test_conditional_get_with_weak_etag(self, client, titles):
+        response = client.get('/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip')
+        assert response['ETag'].startswith('W/')
+        response = client.get(
+            '/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 304
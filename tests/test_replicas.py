@@ -0,0 +1,119 @@
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(transactional_db, tmp_path):
+    """
+    Вторая SQLite-база в роли реплики. Запись в неё не реплицируется,
+    поэтому реплика «отстаёт» на всё, что записано после копирования.
+    """
+    connections.settings[REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    connections.ensure_defaults(REPLICA)
+    connections.prepare_test_settings(REPLICA)
+    call_command('migrate', database=REPLICA, run_syncdb=True, verbosity=0)
+    with override_settings(DATABASE_REPLICAS=[REPLICA]):
+        yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+def copy_to_replica(*models):
+    for model in models:
+        model.objects.using(REPLICA).bulk_create(model.objects.all())
+
+
+@pytest.fixture
+def replicated_title(replica, title, user, another_user):
+    from reviews.models import Category, Genre, GenreTitle, Title
+    from users.models import User
+
+    copy_to_replica(User, Category, Genre, Title, GenreTitle)
+    return title
+
+
+class TestReplicaRouting:
+
+    def test_reads_go_to_replica(self, replicated_title, user,
+                                 another_user_client):
+        from reviews.models import Review
+
+        Review.objects.create(
+            title=replicated_title, author=user, text='Да', score=9)
+        response = another_user_client.get(
+            f'/api/v1/titles/{replicated_title.id}/reviews/')
+        assert response.status_code == 200
+        assert response.data['count'] == 0, (
+            'Проверьте, что GET-запросы читают с реплики'
+        )
+
+    def test_author_reads_own_write(self, replicated_title, user_client,
+                                    another_user_client):
+        reviews_url = f'/api/v1/titles/{replicated_title.id}/reviews/'
+        response = user_client.post(reviews_url, {'text': 'Да', 'score': 9})
+        assert response.status_code == 201
+        assert response.data['id'] not in {
+            review.id
+            for review in replicated_title.reviews.using(REPLICA).all()
+        }
+
+        assert another_user_client.get(reviews_url).data['count'] == 0, (
+            'Проверьте, что остальные пользователи читают с реплики'
+        )
+        assert user_client.get(reviews_url).data['count'] == 1, (
+            'Проверьте, что после записи автор читает с основной базы'
+        )
+
+    def test_response_cache_filled_from_primary(
+            self, replicated_title, user, user_client, another_user_client):
+        from api.replicas import STICKY_KEY, sticky_cache
+
+        title_url = f'/api/v1/titles/{replicated_title.id}/'
+        user_client.post(f'{title_url}reviews/', {'text': 'Да', 'score': 9})
+        response = another_user_client.get(title_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['rating'] == 9, (
+            'Проверьте, что ответ для общего кэша читается с основной базы, '
+            'а не с отстающей реплики'
+        )
+
+        sticky_cache().delete(STICKY_KEY.format(user.id))
+        response = user_client.get(title_url)
+        assert response['X-Cache'] == 'HIT'
+        assert response.data['rating'] == 9
+
+    def test_stickiness_expires(self, replicated_title, user, user_client):
+        from api.replicas import STICKY_KEY, sticky_cache
+
+        reviews_url = f'/api/v1/titles/{replicated_title.id}/reviews/'
+        user_client.post(reviews_url, {'text': 'Да', 'score': 9})
+        assert sticky_cache().get(STICKY_KEY.format(user.id))
+
+        sticky_cache().delete(STICKY_KEY.format(user.id))
+        assert user_client.get(reviews_url).data['count'] == 0, (
+            'Проверьте, что по истечении DATABASE_STICKY_SECONDS '
+            'автор снова читает с реплики'
+        )
+
+
+@pytest.mark.django_db
+class TestReplicaRouter:
+
+    def test_without_replicas_router_does_nothing(self, user_client, title):
+        from api.replicas import ReplicaRouter, current_routing
+        from reviews.models import Title
+
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) is None
+        assert router.db_for_write(Title) == 'default'
+        response = user_client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200
+        assert current_routing.get() is None
@@ -0,0 +1,53 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReviewCreate:
+
+    def test_duplicate_review(self, user_client, review):
+        title = review.title
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, {'text': 'Ещё раз', 'score': 1})
+        assert response.status_code == 400
+        assert response.json() == {
+            'non_field_errors': ['Может существовать только один отзыв!']
+        }, (
+            'Проверьте, что повторный отзыв возвращает прежнюю ошибку '
+            'валидации'
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (10, 1), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг'
+        )
+
+    def test_other_author_can_review(self, another_user_client, review):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        response = another_user_client.post(url, {'text': 'Да', 'score': 4})
+        assert response.status_code == 201
+        assert response.json()['author'] == 'TestUserAnother'
+
+    def test_missing_title(self, user_client):
+        response = user_client.post(
+            '/api/v1/titles/999/reviews/', {'text': 'text', 'score': 5}
+        )
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+class TestNestedRoutes:
+
+    def test_review_must_belong_to_title(self, user_client, review, category):
+        from reviews.models import Title
+
+        other = Title.objects.create(name='Другое', year=2000,
+                                     category=category)
+        url = f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+        assert user_client.get(url).status_code == 404, (
+            'Проверьте, что комментарии доступны только по адресу '
+            'произведения, к которому относится отзыв'
+        )
+        response = user_client.post(url, {'text': 'text'})
+        assert response.status_code == 404
+
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/'
+        assert user_client.post(url, {'text': 'text'}).status_code == 201
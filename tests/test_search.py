@@ -0,0 +1,58 @@
+import pytest
+
+
+@pytest.fixture
+def titles(category):
+    from reviews.models import Title
+
+    return [
+        Title.objects.create(
+            name='Побег из Шоушенка', year=1994, category=category,
+            description='Тюремная драма'
+        ),
+        Title.objects.create(
+            name='Зелёная миля', year=1999, category=category,
+            description='Драма по роману Стивена Кинга о тюрьме'
+        ),
+        Title.objects.create(name='Мост', year=2000, category=category),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTitleSearch:
+
+    def _search(self, client, text):
+        response = client.get('/api/v1/titles/', {'search': text})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_search_by_name_and_description(self, client, titles):
+        assert self._search(client, 'шоушенк') == ['Побег из Шоушенка'], (
+            'Проверьте, что поиск находит произведение по началу слова '
+            'в названии без учёта регистра'
+        )
+        assert self._search(client, 'Кинга') == ['Зелёная миля'], (
+            'Проверьте, что поиск учитывает описание произведения'
+        )
+        assert self._search(client, 'нет такого') == []
+
+    def test_search_index_follows_writes(self, client, titles):
+        bridge = titles[2]
+        bridge.name = 'Мост Шоушенка'
+        bridge.save()
+        assert set(self._search(client, 'Шоушенка')) == {
+            'Побег из Шоушенка', 'Мост Шоушенка'
+        }, 'Проверьте, что поисковый индекс обновляется при изменении'
+        bridge.delete()
+        assert self._search(client, 'Шоушенка') == ['Побег из Шоушенка'], (
+            'Проверьте, что поисковый индекс обновляется при удалении'
+        )
+
+    def test_search_combines_with_filters(self, client, titles):
+        response = client.get(
+            '/api/v1/titles/', {'search': 'драма', 'year': 1999}
+        )
+        assert [title['name'] for title in response.json()['results']] == [
+            'Зелёная миля'
+        ]
+        assert response.json()['count'] == 1
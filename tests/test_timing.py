@@ -0,0 +1,87 @@
+import json
+import logging
+import re
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+
+def server_timing(response):
+    return {
+        metric.split(';')[0]: metric
+        for metric in response['Server-Timing'].split(', ')
+    }
+
+
+@pytest.mark.django_db
+class TestRequestTiming:
+
+    @override_settings(REQUEST_TIMING_HEADER=True)
+    def test_server_timing_header(self, user_client, review):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse('api:reviews-list', args=[review.title_id])
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(url)
+        assert response.status_code == 200
+        metrics = server_timing(response)
+        assert {'db', 'serializer', 'view', 'total'} <= set(metrics), (
+            'Проверьте, что заголовок Server-Timing содержит время базы, '
+            'сериализатора, представления и всего запроса'
+        )
+        assert f'desc="{len(queries)} queries"' in metrics['db'], (
+            'Проверьте, что в Server-Timing указано число запросов к базе'
+        )
+        assert re.search(r'dur=\d+\.\d+', metrics['total'])
+
+    @override_settings(REQUEST_TIMING_HEADER=True)
+    def test_serializer_time_on_drf_path(self, user_client, title):
+        response = user_client.get(
+            reverse('api:title-detail', args=[title.id]))
+        assert 'serializer' in server_timing(response)
+
+    def test_header_off_by_default(self, user_client):
+        response = user_client.get(reverse('api:category-list'))
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что Server-Timing по умолчанию не отправляется'
+        )
+
+    @override_settings(REQUEST_TIMING_SLOW_MS=0, REQUEST_TIMING_TOP_QUERIES=2)
+    def test_slow_request_logged(self, user_client, review, caplog):
+        url = reverse('api:reviews-list', args=[review.title_id])
+        with caplog.at_level(logging.WARNING, logger='api.timing'):
+            user_client.get(url)
+        record = caplog.records[-1].request_stats
+        assert json.loads(caplog.records[-1].getMessage().split(' ', 2)[2]
+                          ) == record
+        assert record['path'] == url and record['status'] == 200
+        assert record['view'] == 'api:reviews-list'
+        assert record['queries'] >= 2
+        slowest = record['slowest_queries']
+        assert len(slowest) == 2, (
+            'Проверьте, что в лог попадают REQUEST_TIMING_TOP_QUERIES '
+            'самых медленных запросов'
+        )
+        assert slowest[0]['ms'] >= slowest[1]['ms']
+
+    def test_fast_request_not_logged(self, user_client, caplog):
+        with caplog.at_level(logging.WARNING, logger='api.timing'):
+            user_client.get(reverse('api:category-list'))
+        assert not caplog.records, (
+            'Проверьте, что быстрые запросы не пишутся в лог'
+        )
+
+    def test_nested_timings_not_doubled(self):
+        from api.timing import RequestStats, timed
+
+        stats = RequestStats()
+        with stats.collect():
+            with timed('serializer'):
+                with timed('serializer'):
+                    pass
+        with timed('serializer'):
+            pass
+        assert list(stats.timings) == ['serializer']
+        assert stats.timings['serializer'] <= stats.total